@@ -4,10 +4,38 @@
 # Description: Implementation of a directed graph ADT
 
 import heapq
-from collections import deque
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 
+from graph_cache import QueryCacheMixin, cached_query
+from graph_io import iter_batches, iter_edge_file, parse_weight, read_snapshot, write_snapshot
+from graph_landmarks import LandmarkIndex
+from graph_order import TopologicalOrder
+from graph_paths import flatten_paths, path_results
+from graph_reach import ReachabilityIndex
+from graph_snapshot import SnapshotMixin
+from graph_stats import GraphStatsMixin, instrumented
+from graph_storage import CSRMatrix, MixedWeights, SparseMatrix
+from graph_traversal import iter_bfs, iter_dfs, multi_source_distances, topological_sort, visit_until
 
-class DirectedGraph:
+try:
+    import numpy as np
+except ImportError:     # NumPy is optional; only the vectorized code paths need it
+    np = None
+
+_FLOYD_DENSITY = 0.05           # edges / V^2 above which Floyd-Warshall beats V Dijkstra runs
+_MIN_PARALLEL_VERTICES = 256    # below this a process pool costs more than it saves
+_BUCKET_MAX_WEIGHT = 64         # largest integer weight for which 'auto' picks the bucket queue over the heap
+_BUCKET_MIN_DEGREE = 2          # and the fewest edges per vertex (see graph_bench.py crossover)
+_BUCKET_LIMIT = 1 << 16         # largest integer weight engine 'bucket' accepts (one bucket per distance unit)
+_BFS_BLOCK = 1 << 20            # matrix entries the 'numpy' bfs copies at a time while expanding a level
+_FLOYD_BLOCK = 1 << 16          # distance entries Floyd-Warshall relaxes per vectorized step (fits in L2)
+_NUMPY_GROWTH = 1.25            # per-dimension growth of the 'numpy' backing array when add_vertex outgrows it
+
+
+class DirectedGraph(QueryCacheMixin, GraphStatsMixin, SnapshotMixin):
     """
     Class to implement directed weighted graph
     - duplicate edges not allowed
@@ -16,6 +44,26 @@ class DirectedGraph:
     - vertex names are integers
     """
 
+    # Backend a loaded or published 'csr' graph is converted to before its first change
+    _WRITABLE_STORAGE = 'sparse'
+    # Opt-in incremental topological order (see track_order)
+    _order = None
+    # (version, topological order or None if there is a cycle) from the last full cycle check
+    _dag = (None, None)
+    # Opt-in transitive-closure reachability index (see track_reachability)
+    _reach = None
+    # Landmark distance tables for a_star (see build_landmarks); ignored once _version moves on
+    _landmarks = None
+    # Preallocated square array behind 'numpy' storage; adj_matrix is its top-left v_count x v_count view
+    _buffer = None
+    # (version, largest weight if every weight is an int else None, edge count) used to pick a dijkstra engine
+    _weights = (None, None, 0)
+    # Ids retired by remove_vertex: a set for lookups and a heap so add_vertex reuses the smallest first
+    _tombstones = None
+    _free = None
+    # Fraction of tombstoned ids above which remove_vertex compacts on its own (None: only on compact())
+    compact_threshold = None
+
     def __init__(self, start_edges=None):
         """
         Store graph info as adjacency matrix
@@ -57,61 +105,123 @@ class DirectedGraph:
     def add_vertex(self) -> int:
         """
         Add new vertex to the graph. Returns the number of vertices in the graph.
+        An id retired by remove_vertex is reused (the smallest one) before any row is grown.
         """
-        self.v_count += 1
-        self.adj_matrix.append([0] * self.v_count)
-        for i in range(0, self.v_count - 1):
-            self.adj_matrix[i].append(0)
+        self._writable()
+        if self._free:
+            vertex = heapq.heappop(self._free)
+            self._tombstones.discard(vertex)
+            self._version += 1
+            self._note_weight(0)
+            self._carry_dag((vertex,))
+            return self.v_count - len(self._free)
+        self._grow_to(self.v_count + 1)
         return self.v_count
 
     def add_edge(self, src: int, dst: int, weight=1) -> None:
         """
         Add one-way edge to the graph ( src --> dst ).
         """
-        if src < 0 or src >= self.v_count:
+        if not self._is_vertex(src):
             return
 
-        if dst < 0 or dst >= self.v_count:
+        if not self._is_vertex(dst):
             return
 
         if src == dst:
             return
 
+        # Does nothing (and keeps cached results) if the edge already has this weight
+        current = self.adj_matrix[src][dst]
+        if current == weight and isinstance(current, float) == isinstance(weight, float):
+            return
+
+        self._writable()
+        self._version += 1
+        self._fit_weight(weight)
+        self._note_weight(weight, int(weight != 0) - int(current != 0))
         self.adj_matrix[src][dst] = weight
+        if self._order is not None:
+            if weight != 0:
+                self._order.add_edge(src, dst)
+            else:
+                self._order.remove_edge(src, dst)
+        if self._reach is not None:
+            if weight != 0:
+                self._reach.add_edge(src, dst)
+            else:
+                self._reach.remove_edge(src, dst)
 
     def remove_edge(self, src: int, dst: int) -> None:
         """
         Remove one-way edge from the graph ( src --> dst ).
         """
-        if src < 0 or src >= self.v_count:
+        if not self._is_vertex(src):
             return
 
-        if dst < 0 or dst >= self.v_count:
+        if not self._is_vertex(dst):
             return
 
         if src == dst:
             return
 
         if self.adj_matrix[src][dst] != 0:
+            self._writable()
+            self._version += 1
+            self._note_weight(0, -1)
+            self._carry_dag()
             self.adj_matrix[src][dst] = 0
+            if self._order is not None:
+                self._order.remove_edge(src, dst)
+            if self._reach is not None:
+                self._reach.remove_edge(src, dst)
+
+    def remove_vertex(self, v: int):
+        """
+        Remove vertex v and every edge into or out of it. The id is tombstoned rather than deleted, so no other
+        vertex changes id and no row is rebuilt; add_vertex reuses it and compact() reclaims the space.
+        If compact_threshold is set and more than that fraction of the ids are tombstones, the graph is compacted
+        and the old --> new id mapping is returned; otherwise None.
+        """
+        if not self._is_vertex(v):
+            return None
+        for src in self._predecessors(v):
+            self.remove_edge(src, v)
+        for dst in list(self._neighbors(v)):
+            self.remove_edge(v, dst)
+        self._writable()
+        self._version += 1          # not carried over: the cached topological order still lists v
+        if self._tombstones is None:
+            self._tombstones, self._free = set(), []
+        self._tombstones.add(v)
+        heapq.heappush(self._free, v)
+        if self.compact_threshold is not None and len(self._free) > self.compact_threshold * self.v_count:
+            return self.compact()
+        return None
 
     def get_vertices(self) -> []:
         """
         Return list of vertices in the graph (any order).
         """
+        if self._tombstones:
+            return [v for v in range(0, self.v_count) if v not in self._tombstones]
         return list(range(0, self.v_count))
 
+    @instrumented
     def get_edges(self) -> []:
         """
         Return list of edges in the graph (any order).
         """
+        if self._buffer is not None:
+            src, dst = np.nonzero(self.adj_matrix)
+            return list(zip(src.tolist(), dst.tolist(), self.adj_matrix[src, dst].tolist()))
         list_of_edges = []
         for i in range(0, self.v_count):
-            for j in range(0, self.v_count):
-                if self.adj_matrix[i][j] != 0:
-                    list_of_edges.append((i, j, self.adj_matrix[i][j]))
+            for j, weight in self._successors(i):
+                list_of_edges.append((i, j, weight))
         return list_of_edges
 
+    @instrumented
     def is_valid_path(self, path: []) -> bool:
         """
         Return True if provided path is valid, False otherwise.
@@ -120,6 +230,15 @@ class DirectedGraph:
         if not path:
             return True
 
+        # Checks that every vertex exists (a negative id would otherwise wrap around the matrix)
+        if not all(self._is_vertex(vertex) for vertex in path):
+            return False
+
+        # Checks every hop with one fancy-indexing lookup
+        if self._buffer is not None and len(path) > 1:
+            hops = np.asarray(path)
+            return bool(np.all(self.adj_matrix[hops[:-1], hops[1:]] != 0))
+
         # Iterates through path and checks for edges. Returns False if current edge checked is invalid.
         index = 0
         while index + 1 != len(path):
@@ -128,52 +247,49 @@ class DirectedGraph:
             index += 1
         return True
 
+    @instrumented
+    def validate_paths(self, paths, offsets=None, first_invalid: bool = False):
+        """
+        Check many paths at once. paths is an iterable of paths or, with offsets, a flat sequence of vertices
+        where path i is paths[offsets[i]:offsets[i + 1]]. Returns a boolean array (see path_results) telling
+        which paths is_valid_path accepts; with first_invalid, also the position in each path of the first
+        vertex that does not exist or has no edge from the one before it (-1 for valid paths).
+        On 'numpy' storage all hops are checked with one fancy-indexing lookup, otherwise hop by hop.
+        """
+        hops, offsets = flatten_paths(paths, offsets)
+        if self._buffer is not None:
+            first = self._first_invalid_bulk(hops, offsets)
+        else:
+            first = [self._first_invalid(hops, offsets[i], offsets[i + 1]) for i in range(len(offsets) - 1)]
+        return path_results(first, first_invalid)
+
+    @instrumented
+    @cached_query
     def dfs(self, v_start, v_end=None) -> []:
         """
         Return list of vertices visited during DFS search.
         Vertices are picked in ascending order.
         """
-        if v_start < 0 or v_start >= self.v_count:
+        if not self._is_vertex(v_start):
             return []
-        if v_end is not None and (v_end < 0 or v_end >= self.v_count):
+        if v_end is not None and not self._is_vertex(v_end):
             v_end = None
-        stack = deque()
-        stack.append(v_start)
-        visited = []
-        while stack:
-            i = stack.pop()
-            if i not in visited:
-                visited.append(i)
-                if i is v_end:
-                    return visited
-                for j in range(self.v_count - 1, -1, -1):
-                    if self.adj_matrix[i][j] != 0:
-                        stack.append(j)
-        return visited
+        return visit_until(self.iter_dfs(v_start), v_end)
 
+    @instrumented
+    @cached_query
     def bfs(self, v_start, v_end=None) -> []:
         """
         Return list of vertices visited during BFS search.
         Vertices are picked in ascending order.
         """
-        if v_start < 0 or v_start >= self.v_count:
+        if not self._is_vertex(v_start):
             return []
-        if v_end is not None and (v_end < 0 or v_end >= self.v_count):
+        if v_end is not None and not self._is_vertex(v_end):
             v_end = None
-        stack = deque()
-        stack.append(v_start)
-        visited = []
-        while stack:
-            i = stack.popleft()
-            if i not in visited:
-                visited.append(i)
-                if i is v_end:
-                    return visited
-                for j in range(0, self.v_count):
-                    if j not in visited and self.adj_matrix[i][j] != 0:
-                        stack.append(j)
-        return visited
+        return visit_until(self.iter_bfs(v_start), v_end)
 
+    @instrumented
     def has_cycle(self):
         """
         Return True if graph contains a cycle, False otherwise
@@ -183,66 +299,958 @@ class DirectedGraph:
         if self.v_count < 2:
             return False
 
-        visited = []
-        path = []
+        # Iterative DFS from every vertex, so long paths cannot hit the recursion limit. The topological
+        # order it produces on the way is kept until an edge is added.
+        return self._topological() is None
 
-        # Checks every DPS path by setting all vertices as the starting vertices for each possible DPS.
-        for vertex in range(0, self.v_count):
+    @instrumented
+    @cached_query
+    def dijkstra(self, src: int, dst: int = None, engine: str = 'auto') -> []:
+        """
+        Returns a list whose elements are the length of the shortest path between the src and the vertices corresponding
+        to the indices of the list.
+        If dst is given the search stops as soon as dst is settled; only distance[dst] and the vertices settled before it
+        are final in that case.
+        engine 'heap' uses a binary heap, 'bucket' a bucket queue (Dial's algorithm, integer weights only) and 'auto'
+        picks the bucket queue when every weight is a small integer and the graph is not path-like. Both give the same
+        result.
+        """
+        # Checks if src vertex exists
+        if not self._is_vertex(src):
+            return
 
-            # Checks if the vertex has been fully analyzed prior to the recursive call
-            if vertex not in visited:
-                if self._has_cycle_rec(vertex, visited, path):
-                    return True
+        # An acyclic graph is solved in O(V + E) by relaxing edges in topological order
+        if engine == 'auto' and dst is None and self._known_acyclic():
+            return self._dag_relax(src)[0]
+        return self._dijkstra(src, dst, engine)[0]
 
-        return False  # All possible DPS paths have been analyzed and no cycle has been found
+    # ------------------------------------------------------------------ #
 
-    def _has_cycle_rec(self, vertex, visited, path):
+    @instrumented
+    def dijkstra_tree(self, src: int, dst: int = None):
         """
-        Recursive helper function for has_cycle.
+        Return (distance, previous) lists for the shortest paths from src. previous[v] is the vertex before v
+        on its shortest path (None for src and unreached vertices). dst stops the search early as in dijkstra.
         """
-        visited.append(vertex)    # keeps track of all vertices that have been fully explored (all edges analyzed)
-        path.append(vertex)  # keeps track of vertices in a single DPS path
+        if not self._is_vertex(src):
+            return None
+        return self._dijkstra(src, dst)
 
-        # Recursive call for all adjacent vertices made
-        for i in range(0, self.v_count):
+    @instrumented
+    def shortest_path(self, src: int, dst: int) -> []:
+        """
+        Return the vertices on a shortest path from src to dst (inclusive), or an empty list if there is none.
+        """
+        if not (self._is_vertex(src) and self._is_vertex(dst)):
+            return []
+        distance, previous = self._dijkstra(src, dst)
+        if distance[dst] == float('inf'):
+            return []
+        return self._build_path(previous, dst)
 
-            # Checks if vertex is adjacent to current vertex being checked prior to entering
-            if self.adj_matrix[vertex][i] != 0:
-                if i not in visited:
-                    if self._has_cycle_rec(i, visited, path):  # Recursion occurs if adj. vertex is not visited
-                        return True
-                elif i in path:
-                    return True       # A cycle is found when the vertex i is both visited and on the current path
+    def iter_dfs(self, v_start):
+        """
+        Yield vertices in DFS order (ascending picks) as they are visited, so callers can stop early.
+        """
+        if not self._is_vertex(v_start):
+            return iter(())
+        return iter_dfs(v_start, self._counted(self._neighbors))
 
-        # Remove vertex from stack after all adjacent nodes have been analyzed
-        path.remove(vertex)
-        return False
+    def iter_bfs(self, v_start):
+        """
+        Yield vertices in BFS order (ascending picks) as they are visited, so callers can stop early.
+        """
+        if not self._is_vertex(v_start):
+            return iter(())
+        if self._buffer is not None:
+            return self._iter_bfs_levels(v_start)
+        return iter_bfs(v_start, self._counted(self._neighbors))
 
-    def dijkstra(self, src: int) -> []:
+    @instrumented
+    def multi_source_bfs(self, sources, max_depth: int = None, batch_size: int = 64) -> []:
         """
-        Returns a list whose elements are the length of the shortest path between the src and the vertices corresponding
-        to the indices of the list.
+        Return one array('i') of BFS hop counts per source, indexed by vertex: -1 where the source does not
+        reach the vertex (within max_depth hops, if given), so reachability is distance >= 0.
+        Sources are searched batch_size at a time, one bit per source in a per-vertex bitmask, so each batch
+        walks the edges once instead of once per source. Invalid sources reach nothing.
         """
-        # Checks if src vertex exists
-        if src < 0 or src >= self.v_count:
+        return multi_source_distances(list(sources), self._is_vertex, self._counted(self._neighbors),
+                                      lambda vertex: vertex, self.v_count, max_depth, batch_size)
+
+    @instrumented
+    def a_star(self, src: int, dst: int, heuristic=None) -> []:
+        """
+        Return the vertices on a shortest path from src to dst (inclusive), or an empty list if there is none.
+        heuristic(v, dst) must never overestimate the distance from v to dst. Without one, the landmark index
+        from build_landmarks is used if it is still current, otherwise the search is plain Dijkstra.
+        """
+        if not (self._is_vertex(src) and self._is_vertex(dst)):
+            return []
+        if heuristic is not None:
+            estimate = lambda v: heuristic(v, dst)
+        elif self.landmarks_current():
+            estimate = self._landmarks.bound_to(dst)
+        else:
+            estimate = None
+        distance, previous = self._a_star(src, dst, estimate)
+        if distance[dst] == float('inf'):
+            return []
+        return self._build_path(previous, dst)
+
+    def build_landmarks(self, count: int = 8, seed=None) -> LandmarkIndex:
+        """
+        Build (or rebuild) the landmark index used by a_star from count landmarks and return it.
+        Costs 2 * count Dijkstra runs; any later change to the graph makes the index stale.
+        """
+        self._landmarks = LandmarkIndex.build(self, count, seed)
+        return self._landmarks
+
+    def landmarks_current(self) -> bool:
+        """
+        Return True if a landmark index is attached and the graph has not changed since it was built.
+        """
+        return self._landmarks is not None and self._landmarks.version == self._version
+
+    def save_landmarks(self, path: str) -> None:
+        """
+        Write the current landmark index to path.
+        """
+        if not self.landmarks_current():
+            raise ValueError('no current landmark index to save')
+        self._landmarks.save(path)
+
+    def load_landmarks(self, path: str) -> None:
+        """
+        Attach a landmark index saved from this graph. The caller vouches that the graph has not changed since.
+        """
+        index = LandmarkIndex.load(path)
+        if index.dist_from and len(index.dist_from[0]) != self.v_count:
+            raise ValueError(f'landmark index is for {len(index.dist_from[0])} vertices, graph has {self.v_count}')
+        index.version = self._version
+        self._landmarks = index
+
+    @instrumented
+    def all_pairs_shortest_paths(self, engine: str = 'auto', processes: int = None):
+        """
+        Return a V x V table whose row i holds the same distances as dijkstra(i).
+        engine 'floyd' runs a NumPy-vectorized Floyd-Warshall (dense graphs), 'dijkstra' runs one Dijkstra per
+        source across a process pool writing into shared memory (sparse graphs), 'auto' picks by edge density.
+        processes only applies to 'dijkstra'; it is ignored when 'floyd' is given or picked by 'auto'.
+        The table is a float64 NumPy array, or a list of array('d') rows when NumPy is not installed.
+        Rows of removed vertex ids are all inf (dijkstra returns None for them).
+        """
+        if engine == 'auto':
+            dense = self.v_count and self._edge_count() >= _FLOYD_DENSITY * self.v_count ** 2
+            engine = 'floyd' if np is not None and dense else 'dijkstra'
+        if engine == 'floyd':
+            return self._floyd_warshall()
+        if engine == 'dijkstra':
+            return self._all_pairs_dijkstra(processes)
+        raise ValueError(f"unknown engine '{engine}'")
+
+    def track_order(self, enabled: bool = True) -> None:
+        """
+        Turn incremental topological ordering on or off. While on, has_cycle is O(1) and add_edge only
+        reorders the vertices between the new edge's endpoints.
+        """
+        self._order = TopologicalOrder(self) if enabled else None
+
+    def would_create_cycle(self, src: int, dst: int) -> bool:
+        """
+        Return True if the graph has a cycle, or would have one after adding edge src --> dst.
+        """
+        if not (self._is_vertex(src) and self._is_vertex(dst)):
+            return self.has_cycle()
+        if self._order is not None:
+            return self._order.would_create_cycle(src, dst)
+        return self.has_cycle() or (src != dst and self.is_reachable(dst, src))
+
+    def track_reachability(self, enabled: bool = True) -> None:
+        """
+        Turn the reachability index on or off. While on, is_reachable is O(1); add_edge updates the index in
+        place unless the edge merges strongly connected components, and remove_edge makes the next query
+        rebuild it. The index needs about C^2 / 8 bytes for C components (see reachability_nbytes).
+        """
+        self._reach = ReachabilityIndex(self) if enabled else None
+
+    def is_reachable(self, src: int, dst: int) -> bool:
+        """
+        Return True if there is a path from src to dst (every vertex reaches itself).
+        """
+        if not (self._is_vertex(src) and self._is_vertex(dst)):
+            return False
+        if self._reach is not None:
+            return self._reach.reaches(src, dst)
+        return any(vertex == dst for vertex in self.iter_dfs(src))
+
+    def reachability_nbytes(self) -> int:
+        """
+        Return the memory held by the reachability index in bytes, or 0 if it is off.
+        """
+        if self._reach is None:
+            return 0
+        return self._reach.nbytes()
+
+    def topological_order(self):
+        """
+        Return the vertices in an order where every edge points forward, or None if the graph has a cycle.
+        The order is computed iteratively and cached until an edge is added.
+        """
+        order = self._topological()
+        if order is None:
+            return None
+        if self._tombstones:
+            return [v for v in order if v not in self._tombstones]
+        return list(order)
+
+    @instrumented
+    def dag_shortest_paths(self, src: int) -> []:
+        """
+        Return the same distances as dijkstra(src) for an acyclic graph, relaxing each edge once in topological
+        order (O(V + E), no priority queue). Raises ValueError if the graph has a cycle.
+        """
+        if not self._is_vertex(src):
+            return
+        if self._topological() is None:
+            raise ValueError('graph has a cycle')
+        return self._dag_relax(src)[0]
+
+    @instrumented
+    def dag_longest_path(self) -> []:
+        """
+        Return the vertices of a path with the largest total weight (the critical path of a job graph) in O(V + E).
+        Raises ValueError if the graph has a cycle.
+        """
+        order = self.topological_order()
+        if order is None:
+            raise ValueError('graph has a cycle')
+        if not order:
+            return []
+        longest = [0] * self.v_count
+        previous = [None] * self.v_count
+        for vertex in order:
+            for i, weight in self._successors(vertex):
+                if longest[vertex] + weight > longest[i]:
+                    longest[i] = longest[vertex] + weight
+                    previous[i] = vertex
+        return self._build_path(previous, max(order, key=longest.__getitem__))
+
+    @classmethod
+    def sparse(cls, start_edges=None):
+        """
+        Return a new graph that uses sparse storage from the start.
+        Takes the same start_edges as the constructor.
+        """
+        graph = cls()
+        graph.set_storage('sparse')
+        if start_edges is not None:
+            v_count = 0
+            for u, v, _ in start_edges:
+                v_count = max(v_count, u, v)
+            for _ in range(v_count + 1):
+                graph.add_vertex()
+            for u, v, weight in start_edges:
+                graph.add_edge(u, v, weight)
+        return graph
+
+    @classmethod
+    def from_edge_file(cls, path: str, storage: str = 'dense'):
+        """
+        Return a new graph loaded from an edge-list file of 'src dst [weight]' lines (CSV or whitespace).
+        The file is streamed twice: once to size the matrix in a single allocation, once to load the edges.
+        """
+        graph = cls()
+        graph.set_storage(storage)
+        v_count = 0
+        for fields in iter_edge_file(path):
+            v_count = max(v_count, int(fields[0]) + 1, int(fields[1]) + 1)
+        graph._grow_to(v_count)
+        graph.add_edges_bulk(cls._parse_edge_fields(fields) for fields in iter_edge_file(path))
+        return graph
+
+    def add_edges_bulk(self, edges, batch_size: int = 65536) -> None:
+        """
+        Add many (src, dst[, weight]) edges. Vertices are added so every src and dst exists, like the
+        constructor does; edges touching a removed vertex are skipped. Edges are consumed lazily in batches;
+        duplicates within a batch collapse to the last weight given before the matrix is touched.
+        """
+        self._writable()
+        for batch in iter_batches(edges, batch_size):
+            unique = {}
+            top = self.v_count - 1
+            tombstones = self._tombstones
+            for edge in batch:
+                src, dst = edge[0], edge[1]
+                if src < 0 or dst < 0 or (tombstones and (src in tombstones or dst in tombstones)):
+                    continue
+                if src > top:
+                    top = src
+                if dst > top:
+                    top = dst
+                if src != dst:
+                    unique[(src, dst)] = edge[2] if len(edge) > 2 else 1
+            self._grow_to(top + 1)
+            self._version += 1
+            for (src, dst), weight in unique.items():
+                self._fit_weight(weight)
+                matrix = self.adj_matrix        # _fit_weight may have replaced the 'numpy' array
+                matrix[src][dst] = weight
+        if self._order is not None:
+            self._order.rebuild()
+        if self._reach is not None:
+            self._reach.rebuild()
+
+    @property
+    def storage(self) -> str:
+        """
+        Name of the backend currently holding adj_matrix ('dense', 'numpy', 'sparse' or 'csr').
+        """
+        if self._buffer is not None:
+            return 'numpy'
+        if isinstance(self.adj_matrix, SparseMatrix):
+            return 'sparse'
+        if isinstance(self.adj_matrix, CSRMatrix):
+            return 'csr'
+        return 'dense'
+
+    def set_storage(self, kind: str) -> None:
+        """
+        Convert adj_matrix to another backend in place.
+        'dense' is a list of lists (O(V^2) memory), 'sparse' keeps one dict per vertex (O(V + E) memory).
+        'numpy' is a dense NumPy array (int64, or object once a weight is not integral) that vectorizes
+        row scans, get_edges, is_valid_path and bfs.
+        The read-only 'csr' backend only comes from load() and can be converted away but not to.
+        """
+        if kind not in ('dense', 'numpy', 'sparse'):
+            raise ValueError(f"unknown storage '{kind}'")
+        self._check_unpublished()
+        if kind == self.storage:
+            return
+        if kind == 'numpy':
+            if np is None:
+                raise ImportError("storage 'numpy' requires NumPy")
+            edges = self.get_edges()
+            integral = all(isinstance(weight, int) for _, _, weight in edges)
+            buffer = np.zeros((self.v_count, self.v_count), dtype=np.int64 if integral else object)
+            for i, j, weight in edges:
+                buffer[i, j] = weight
+            self._buffer = self.adj_matrix = buffer
+        elif kind == 'sparse':
+            matrix = SparseMatrix(self.v_count)
+            for i in range(self.v_count):
+                row = matrix[i]
+                for j, weight in self._successors(i):
+                    row[j] = weight
+            self._buffer = None
+            self.adj_matrix = matrix
+        elif self._buffer is not None:
+            self._buffer = None
+            self.adj_matrix = self.adj_matrix.tolist()
+        else:
+            self.adj_matrix = [list(row) for row in self.adj_matrix]
+
+    def compact(self) -> dict:
+        """
+        Renumber the live vertices 0..n-1 in their current order, dropping every tombstoned id, and rebuild the
+        storage (same backend; 'csr' becomes 'sparse'). Returns the old --> new id mapping of the live vertices.
+        """
+        self._writable()
+        live = self.get_vertices()
+        mapping = {old: new for new, old in enumerate(live)}
+        if self._tombstones:
+            kind = self.storage
+            fresh = type(self).sparse()
+            fresh._grow_to(len(live))
+            fresh.add_edges_bulk((mapping[src], mapping[dst], weight) for src, dst, weight in self.get_edges())
+            fresh.set_storage(kind)
+            self.adj_matrix, self._buffer, self.v_count = fresh.adj_matrix, fresh._buffer, fresh.v_count
+            self._tombstones = self._free = None
+            self._version += 1
+            if self._order is not None:
+                self._order.rebuild()
+            if self._reach is not None:
+                self._reach.rebuild()
+        return mapping
+
+    def save(self, path: str) -> None:
+        """
+        Write the graph to path as a binary snapshot (CSR offsets, targets and weights) for load().
+        Removed vertex ids are stored too, so they stay removed (and reusable) after loading.
+        """
+        write_snapshot(path, True, *self._csr_arrays(), removed=self._tombstones or ())
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """
+        Return a graph read from a snapshot written by save(). With mmap the file is mapped and served in place
+        (read-only 'csr' storage shared through the page cache); the first change converts it to 'sparse'.
+        """
+        snapshot = read_snapshot(path, mmap)
+        if not snapshot.directed:
+            raise ValueError(f'{path} holds an undirected graph')
+        graph = cls()
+        graph.adj_matrix = CSRMatrix(snapshot.offsets, snapshot.targets, snapshot.weights, snapshot)
+        graph.v_count = snapshot.v_count
+        if len(snapshot.removed):
+            graph._tombstones, graph._free = set(snapshot.removed), sorted(snapshot.removed)
+        return graph
+
+    def _first_invalid(self, hops, start: int, end: int) -> int:
+        """
+        Return the position (counted from start) of the first invalid vertex of path hops[start:end], or -1.
+        """
+        matrix = self.adj_matrix
+        previous = None
+        for index in range(start, end):
+            vertex = hops[index]
+            if not self._is_vertex(vertex) or (index > start and matrix[previous][vertex] == 0):
+                return index - start
+            previous = vertex
+        return -1
+
+    def _first_invalid_bulk(self, hops, offsets):
+        """
+        _first_invalid for every path at once on 'numpy' storage: out-of-range and tombstoned vertices are
+        masked, every hop is looked up in the matrix in one go, and each path's first bad position is found
+        with one segmented minimum.
+        """
+        hops = np.asarray(hops, dtype=np.int64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        first = np.full(len(offsets) - 1, -1, dtype=np.int64)
+        if not hops.size:
+            return first
+        bad = (hops < 0) | (hops >= self.v_count)
+        if self._tombstones:
+            bad |= np.isin(hops, list(self._tombstones))
+        safe = np.where(bad, 0, hops)
+
+        # Every position that does not start a path must be reached by an edge from the position before it
+        follows = np.ones(hops.size, dtype=bool)
+        starts = offsets[:-1]
+        follows[starts[starts < hops.size]] = False
+        missing = np.zeros(hops.size, dtype=bool)
+        missing[1:] = self.adj_matrix[safe[:-1], safe[1:]] == 0
+        bad |= follows & missing
+
+        positions = np.where(bad, np.arange(hops.size), hops.size)
+        nonempty = offsets[1:] > starts
+        if nonempty.any():
+            found = np.minimum.reduceat(positions, starts[nonempty])
+            first[nonempty] = np.where(found < offsets[1:][nonempty], found - starts[nonempty], -1)
+        return first
+
+    def _freeze(self, published) -> None:
+        """
+        Fill the empty graph published with a read-only 'csr' copy of this one (see publish).
+        """
+        published.adj_matrix = CSRMatrix(*self._csr_arrays())
+        published.v_count = self.v_count
+        if self._tombstones:
+            published._tombstones, published._free = set(self._tombstones), list(self._free)
+
+    def _csr_arrays(self) -> tuple:
+        """
+        Return (offsets, targets, weights) arrays holding the graph in compressed sparse row form.
+        Weights are int64 or float64, or a MixedWeights when the graph has both, so every int stays an int.
+        """
+        offsets, targets, weights = array('q', [0]), array('i'), []
+        for i in range(self.v_count):
+            for j, weight in self._successors(i):
+                targets.append(j)
+                weights.append(weight)
+            offsets.append(len(targets))
+        integral = sum(isinstance(weight, int) for weight in weights)
+        if integral == len(weights):
+            return offsets, targets, array('q', weights)
+        if not integral:
+            return offsets, targets, array('d', weights)
+        return offsets, targets, MixedWeights.pack(weights)
+
+    def _iter_bfs_levels(self, v_start: int):
+        """
+        BFS over 'numpy' storage one whole level at a time. The next level is every unvisited column with a
+        non-zero entry in the current level's rows; it is ordered by the position of its first parent in the
+        current level, then by vertex, which is exactly the order the queue-based bfs visits it in.
+        The level's rows are read in blocks of about _BFS_BLOCK entries, so a wide level never copies more
+        than that much of the matrix at once. Columns found in one block are marked visited before the next,
+        so each keeps the first parent from the earliest block.
+        """
+        visited = np.zeros(self.v_count, dtype=bool)
+        visited[v_start] = True
+        level = np.array([v_start])
+        rows = max(1, _BFS_BLOCK // self.v_count)
+        yield v_start
+        while level.size:
+            found, first_parent = [], []
+            for start in range(0, level.size, rows):
+                reach = self.adj_matrix[level[start:start + rows]] != 0
+                reach[:, visited] = False
+                columns = np.flatnonzero(reach.any(axis=0))
+                if columns.size:
+                    found.append(columns)
+                    first_parent.append(reach[:, columns].argmax(axis=0) + start)
+                    visited[columns] = True
+            if not found:
+                return
+            found, first_parent = np.concatenate(found), np.concatenate(first_parent)
+            level = found[np.lexsort((found, first_parent))]
+            if self._stats is not None:
+                self._stats.record(popped=level.size)
+            yield from level.tolist()
+
+    def _fit_weight(self, weight) -> None:
+        """
+        Switch 'numpy' storage from int64 to object before a weight that int64 cannot hold is stored.
+        An object array keeps every weight as the Python number it was given, so integer weights still
+        read back as ints (a float64 array would turn 7 into 7.0 in get_edges, __str__ and dijkstra).
+        """
+        if self._buffer is not None and self._buffer.dtype != object and \
+                not isinstance(weight, (int, np.integer)):
+            self._buffer = self._buffer.astype(object)
+            self.adj_matrix = self._buffer[:self.v_count, :self.v_count]
+
+    def _grow_to(self, v_count: int) -> None:
+        """
+        Add vertices until the graph has v_count of them, growing every row once rather than once per vertex.
+        On 'numpy' storage a bulk grow sizes the backing array exactly, while a single added vertex that does
+        not fit grows it by _NUMPY_GROWTH per dimension, so at most ~56% of the array is spare capacity.
+        """
+        added = v_count - self.v_count
+        if added <= 0:
             return
+        self._writable()
+        self._version += 1
+        self._note_weight(0)
+        self._carry_dag(range(self.v_count, v_count))
+        if self._order is not None:
+            for _ in range(added):
+                self._order.add_vertex()
+        if self._reach is not None:
+            for _ in range(added):
+                self._reach.add_vertex()
+        if self._buffer is not None:
+            # Grow the backing array geometrically so adding vertices one by one stays amortized O(V)
+            if v_count > len(self._buffer):
+                size = v_count if added > 1 else max(v_count, int(_NUMPY_GROWTH * len(self._buffer)) + 1)
+                buffer = np.zeros((size, size), dtype=self._buffer.dtype)
+                buffer[:self.v_count, :self.v_count] = self.adj_matrix
+                self._buffer = buffer
+            self.adj_matrix = self._buffer[:v_count, :v_count]
+        elif isinstance(self.adj_matrix, SparseMatrix):
+            self.adj_matrix.add_rows(added)
+        else:
+            padding = [0] * added
+            for row in self.adj_matrix:
+                row.extend(padding)
+            self.adj_matrix.extend([0] * v_count for _ in range(added))
+        self.v_count = v_count
+
+    @staticmethod
+    def _parse_edge_fields(fields: []) -> tuple:
+        """
+        Convert the text fields of one edge-list line to a (src, dst, weight) edge.
+        """
+        weight = parse_weight(fields[2]) if len(fields) > 2 else 1
+        return int(fields[0]), int(fields[1]), weight
+
+    def _dijkstra(self, src: int, dst: int = None, engine: str = 'auto'):
+        """
+        Run Dijkstra from src with the given engine (see dijkstra) and return (distance, previous).
+        """
+        if engine == 'heap':
+            return self._heap_dijkstra(src, dst)
+        if engine not in ('auto', 'bucket'):
+            raise ValueError(f"unknown engine '{engine}'")
+        bound, edges = self._weight_profile()
+        if engine == 'bucket':
+            if bound is None:
+                raise ValueError("engine 'bucket' needs integer edge weights")
+            if bound > _BUCKET_LIMIT:
+                raise ValueError(f"engine 'bucket' supports edge weights up to {_BUCKET_LIMIT}, graph has {bound}")
+            return self._bucket_dijkstra(src, dst, bound)
+        # Sweeping the buckets costs one step per distance value, which only pays off when each step
+        # settles several vertices: small weights and more than a path's worth of edges
+        if bound is not None and bound <= _BUCKET_MAX_WEIGHT and edges >= _BUCKET_MIN_DEGREE * self.v_count:
+            return self._bucket_dijkstra(src, dst, bound)
+        return self._heap_dijkstra(src, dst)
+
+    def _dag_relax(self, src: int):
+        """
+        Single-source shortest paths on an acyclic graph by relaxing the edges of every vertex in topological
+        order, starting at src. Returns (distance, previous) like _dijkstra.
+        """
+        order = self._topological()
+        distance = [float('inf')] * self.v_count
+        previous = [None] * self.v_count
+        distance[src] = 0
+        popped = scanned = 0
+        for vertex in order[order.index(src):]:
+            dist = distance[vertex]
+            if dist == float('inf'):
+                continue
+            popped += 1
+            successors = self._successors(vertex)
+            scanned += len(successors)
+            for i, weight in successors:
+                if dist + weight < distance[i]:
+                    distance[i] = dist + weight
+                    previous[i] = vertex
+        if self._stats is not None:
+            self._stats.record(popped, scanned)
+        return distance, previous
+
+    def _topological(self):
+        """
+        Return a topological order of the vertices, or None if the graph has a cycle. Uses the order tracker
+        when it is on, otherwise the cached order of the current version (computing it if needed).
+        The list is shared; do not modify it.
+        """
+        if self._order is not None:
+            return None if self._order.has_cycle() else self._order.order
+        version, order = self._dag
+        if version != self._version:
+            order = topological_sort(self.get_vertices(), self._counted(self._neighbors), self._stats)
+            self._dag = (self._version, order)
+        return order
+
+    def _known_acyclic(self) -> bool:
+        """
+        Return True if the graph is already known to be acyclic, without checking it.
+        """
+        if self._order is not None:
+            return self._order.known_acyclic()
+        version, order = self._dag
+        return version == self._version and order is not None
+
+    def _carry_dag(self, new_vertices: range = range(0)) -> None:
+        """
+        Carry a cached topological order over a change that cannot create a cycle (removing an edge, adding
+        new_vertices), if it was current before the change.
+        """
+        version, order = self._dag
+        if version == self._version - 1 and order is not None:
+            order.extend(new_vertices)
+            self._dag = (self._version, order)
+
+    def _heap_dijkstra(self, src: int, dst: int = None):
+        """
+        Heap-based Dijkstra from src with lazy deletion: a vertex is pushed only when its distance improves and
+        stale heap entries are skipped when popped. Returns (distance, previous).
+        """
+        distance = [float('inf')] * self.v_count
+        previous = [None] * self.v_count
+        settled = bytearray(self.v_count)
+        distance[src] = 0
+        priority = [(0, src)]
+        pops = pushes = popped = scanned = 0
+
+        while priority:
+            dist, vertex = heapq.heappop(priority)
+            pops += 1
+            if settled[vertex] or dist > distance[vertex]:
+                continue
+            settled[vertex] = 1
+            popped += 1
+            if vertex == dst:
+                break
+            successors = self._successors(vertex)
+            scanned += len(successors)
+            for i, weight in successors:
+                candidate = dist + weight
+                if candidate < distance[i]:
+                    distance[i] = candidate
+                    previous[i] = vertex
+                    heapq.heappush(priority, (candidate, i))
+                    pushes += 1
+        if self._stats is not None:
+            self._stats.record(popped, scanned, pushes + 1, pops)
+        return distance, previous
+
+    def _bucket_dijkstra(self, src: int, dst: int = None, max_weight: int = 1):
+        """
+        Dijkstra with a circular bucket queue (Dial's algorithm) for integer weights of at most max_weight:
+        bucket d % (max_weight + 1) holds the vertices queued at distance d, and the buckets are swept in
+        distance order. Each bucket is settled in ascending vertex order, the same (distance, vertex) order
+        the heap pops in, so distance and previous come out identical to _heap_dijkstra.
+        """
+        distance = [float('inf')] * self.v_count
+        previous = [None] * self.v_count
+        settled = bytearray(self.v_count)
+        distance[src] = 0
+        size = max_weight + 1
+        buckets = [[] for _ in range(size)]
+        buckets[0].append(src)
+        queued = 1
+        current = 0
+        pops = pushes = popped = scanned = 0
+
+        while queued:
+            bucket = buckets[current % size]
+            if bucket:
+                queued -= len(bucket)
+                pops += len(bucket)
+                if len(bucket) > 1:
+                    bucket.sort()       # duplicates and stale entries are skipped below
+                # Positive weights never queue into the bucket being settled, so it can be walked in place
+                for vertex in bucket:
+                    if settled[vertex] or distance[vertex] != current:
+                        continue
+                    settled[vertex] = 1
+                    popped += 1
+                    if vertex == dst:
+                        queued = 0
+                        break
+                    successors = self._successors(vertex)
+                    scanned += len(successors)
+                    for i, weight in successors:
+                        candidate = current + weight
+                        if candidate < distance[i]:
+                            distance[i] = candidate
+                            previous[i] = vertex
+                            buckets[candidate % size].append(i)
+                            queued += 1
+                            pushes += 1
+                bucket.clear()
+            current += 1
+        if self._stats is not None:
+            self._stats.record(popped, scanned, pushes + 1, pops)
+        return distance, previous
+
+    def _weight_profile(self) -> tuple:
+        """
+        Return (bound, edges): an upper bound on the edge weights if they are all integers (otherwise None)
+        and the edge count. Both are computed once per graph version and carried across add_edge and
+        remove_edge, which adjust the edge count by one from the cell they overwrite.
+        """
+        version, bound, edges = self._weights
+        if version == self._version:
+            return bound, edges
+        edges = self._edge_count()
+        if self._buffer is not None:
+            integral = self.adj_matrix.dtype.kind in 'iu'
+            bound = int(self.adj_matrix.max(initial=0)) if integral else None
+        else:
+            bound = 0
+            for i in range(self.v_count):
+                for _, weight in self._successors(i):
+                    if not isinstance(weight, int):
+                        bound = None
+                        break
+                    if weight > bound:
+                        bound = weight
+                if bound is None:
+                    break
+        self._weights = (self._version, bound, edges)
+        return bound, edges
+
+    def _note_weight(self, weight, added: int = 0) -> None:
+        """
+        Carry the cached weight profile over a change that stores weight and changes the edge count by added,
+        if it was current before the change.
+        """
+        version, bound, edges = self._weights
+        if version == self._version - 1:
+            if bound is not None and isinstance(weight, int):
+                bound = max(bound, weight)
+            else:
+                bound = None
+            self._weights = (self._version, bound, edges + added)
 
-        distance = [float('inf')] * self.v_count  # Initialize all to infinity
-        distance[src] = 0  # Initialize the source distance as 0
-        priority = []  # represented as a min heap
-        visited = []
-        heapq.heappush(priority, [distance[src], src])  # add source vertex to priority queue
+    def _a_star(self, src: int, dst: int, estimate=None):
+        """
+        A* from src to dst ordered by distance + estimate(v). With no estimate this is Dijkstra with
+        early exit. Returns (distance, previous) like _dijkstra; only distance[dst] is guaranteed final.
+        """
+        if estimate is None:
+            return self._dijkstra(src, dst)
+        inf = float('inf')
+        distance = [inf] * self.v_count
+        previous = [None] * self.v_count
+        distance[src] = 0
+        priority = [(estimate(src), 0, src)]
+        pops = pushes = popped = scanned = 0
 
         while priority:
-            vertex = heapq.heappop(priority)[1]  # gets vertex with smallest distance
-            if vertex not in visited:
-                visited.append(vertex)
-                for i in range(0, self.v_count):
-                    if self.adj_matrix[vertex][i] != 0:
-                        # Update adj. vertex's current minimum distance value and add adj. vertex to the priority queue
-                        distance[i] = min(distance[i], distance[vertex] + self.adj_matrix[vertex][i])
-                        heapq.heappush(priority, [distance[i], i])
-        return distance
+            _, dist, vertex = heapq.heappop(priority)
+            pops += 1
+            if dist > distance[vertex]:
+                continue
+            popped += 1
+            if vertex == dst:
+                break
+            successors = self._successors(vertex)
+            scanned += len(successors)
+            for i, weight in successors:
+                candidate = dist + weight
+                if candidate < distance[i]:
+                    remaining = estimate(i)
+                    if remaining == inf:
+                        continue        # i provably cannot reach dst
+                    distance[i] = candidate
+                    previous[i] = vertex
+                    heapq.heappush(priority, (candidate + remaining, candidate, i))
+                    pushes += 1
+        if self._stats is not None:
+            self._stats.record(popped, scanned, pushes + 1, pops)
+        return distance, previous
+
+    def _floyd_warshall(self):
+        """
+        All-pairs distances by Floyd-Warshall, relaxing through one intermediate vertex per step. Each step
+        works through the rows in blocks of about _FLOYD_BLOCK entries with one preallocated scratch block,
+        so no n x n temporary is allocated and the scratch stays in cache. Runs in this process.
+        """
+        if np is None:
+            raise ImportError("engine 'floyd' requires NumPy")
+        n = self.v_count
+        if self._buffer is not None:
+            dist = np.where(self.adj_matrix != 0, self.adj_matrix, np.inf).astype(np.float64)
+        else:
+            dist = np.full((n, n), np.inf)
+            for i in range(n):
+                for j, weight in self._successors(i):
+                    dist[i, j] = weight
+        np.fill_diagonal(dist, 0)
+        rows = max(1, _FLOYD_BLOCK // max(n, 1))
+        scratch = np.empty((rows, n))
+        for k in range(n):
+            # Row k and column k do not change in step k, so the rows can be relaxed block by block
+            column, row = dist[:, k, None], dist[None, k, :]
+            for start in range(0, n, rows):
+                end = min(n, start + rows)
+                through = scratch[:end - start]
+                np.add(column[start:end], row, out=through)
+                np.minimum(dist[start:end], through, out=dist[start:end])
+        if self._tombstones:
+            dist[sorted(self._tombstones)] = np.inf
+        return dist
+
+    def _all_pairs_dijkstra(self, processes: int = None):
+        """
+        All-pairs distances by running Dijkstra from every vertex, fanned out over worker processes that write
+        their rows directly into one shared-memory table.
+        """
+        n = self.v_count
+        if processes is None:
+            processes = os.cpu_count() or 1
+        processes = min(processes, n)
+        unreachable = [float('inf')] * n
+        if processes <= 1 or n < _MIN_PARALLEL_VERTICES:
+            rows = [self._dijkstra(src)[0] if self._is_vertex(src) else unreachable for src in range(n)]
+            if np is not None:
+                return np.array(rows, dtype=float).reshape(n, n)
+            return [array('d', row) for row in rows]
+
+        adjacency = [self._successors(i) for i in range(n)]
+        table = shared_memory.SharedMemory(create=True, size=n * n * 8)
+        try:
+            # Interleave sources so each worker gets a similar mix of cheap and expensive rows
+            live = self.get_vertices()
+            chunks = [live[start::processes] for start in range(processes)]
+            with ProcessPoolExecutor(processes, initializer=_apsp_init, initargs=(adjacency, table.name)) as pool:
+                for _ in pool.map(_apsp_rows, chunks):
+                    pass
+            with table.buf.cast('d') as cells:
+                for src in self._tombstones or ():
+                    cells[src * n:(src + 1) * n] = array('d', unreachable)
+            if np is not None:
+                return np.ndarray((n, n), dtype=np.float64, buffer=table.buf).copy()
+            rows = []
+            for i in range(n):
+                row = array('d')
+                row.frombytes(table.buf[i * n * 8:(i + 1) * n * 8])
+                rows.append(row)
+            return rows
+        finally:
+            table.close()
+            table.unlink()
+
+    def _edge_count(self) -> int:
+        """
+        Return number of edges in the graph.
+        """
+        if self._buffer is not None:
+            return int(np.count_nonzero(self.adj_matrix))
+        if not isinstance(self.adj_matrix, list):
+            return self.adj_matrix.nnz()
+        return sum(len(self._successors(i)) for i in range(self.v_count))
+
+    def _is_vertex(self, v) -> bool:
+        """
+        Return True if v is the id of a vertex in the graph (in range and not tombstoned).
+        """
+        return 0 <= v < self.v_count and (self._tombstones is None or v not in self._tombstones)
+
+    def _predecessors(self, vertex: int) -> []:
+        """
+        Return the sources of the edges entering vertex in ascending order.
+        """
+        if self._buffer is not None:
+            return np.flatnonzero(self.adj_matrix[:, vertex]).tolist()
+        matrix = self.adj_matrix
+        return [i for i in range(self.v_count) if matrix[i][vertex] != 0]
+
+    @staticmethod
+    def _build_path(previous: [], dst: int) -> []:
+        """
+        Walk a predecessor list back from dst and return the path in src -> dst order.
+        """
+        path = []
+        vertex = dst
+        while vertex is not None:
+            path.append(vertex)
+            vertex = previous[vertex]
+        path.reverse()
+        return path
+
+    def _neighbors(self, vertex: int) -> []:
+        """
+        Return the destinations of the edges leaving vertex in ascending order.
+        """
+        row = self.adj_matrix[vertex]
+        if isinstance(row, list):
+            return [j for j, weight in enumerate(row) if weight != 0]
+        if self._buffer is not None:
+            return np.flatnonzero(row).tolist()
+        return row.keys()
+
+    def _successors(self, vertex: int) -> []:
+        """
+        Return (dst, weight) pairs for the edges leaving vertex in ascending dst order.
+        """
+        row = self.adj_matrix[vertex]
+        if isinstance(row, list):
+            return [(j, weight) for j, weight in enumerate(row) if weight != 0]
+        if self._buffer is not None:
+            columns = np.flatnonzero(row)
+            return list(zip(columns.tolist(), row[columns].tolist()))
+        return row.items()
+
+
+# Worker state for DirectedGraph._all_pairs_dijkstra, set once per process by _apsp_init
+_apsp_graph = None
+_apsp_table = None
+
+
+def _apsp_init(adjacency: [], table_name: str) -> None:
+    """
+    Rebuild the graph from its successor lists and attach to the shared distance table.
+    """
+    global _apsp_graph, _apsp_table
+    _apsp_graph = DirectedGraph.sparse()
+    _apsp_graph.add_edges_bulk((i, j, weight) for i, row in enumerate(adjacency) for j, weight in row)
+    _apsp_graph._grow_to(len(adjacency))
+    _apsp_table = shared_memory.SharedMemory(name=table_name)
+
+
+def _apsp_rows(sources) -> None:
+    """
+    Compute the distance rows for sources and store them in the shared table.
+    """
+    n = _apsp_graph.v_count
+    with _apsp_table.buf.cast('d') as table:
+        for src in sources:
+            table[src * n:(src + 1) * n] = array('d', _apsp_graph._dijkstra(src)[0])
 
 
 if __name__ == '__main__':
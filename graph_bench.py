@@ -0,0 +1,514 @@
+# Course: CS261 - Data Structures
+# Author: Nelsyda Perez
+# Assignment: 6 - Graph Implementation
+# Description: Reproducible benchmark suite for the undirected and directed graph ADTs
+"""
+Time the query, mutation, conversion and loading methods of UndirectedGraph and DirectedGraph on seeded
+generated graphs and record wall time and peak memory to JSON. Switches and plain accessors (enable_cache,
+enable_stats, stats, storage and the like) are not benchmarked.
+
+Usage:
+  python graph_bench.py run --sizes 1000 100000 --out before.json
+  python graph_bench.py compare before.json after.json --threshold 1.25
+  python graph_bench.py crossover --edges 100000
+"""
+
+import argparse
+import collections
+import gc
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from d_graph import DirectedGraph
+from ud_graph import UndirectedGraph
+
+_OPS = 1000                  # operations per timing for the per-edge and per-query benchmarks
+_DENSE_MAX_VERTICES = 5000   # above this a dense DirectedGraph matrix is not built
+_REACH_MAX_VERTICES = 20000  # above this the reachability index (quadratic in components) is not built
+
+
+# ------------------------------------------------------------------ #
+# Graph generators. Each returns (vertex count, [(src, dst, weight), ...]) with vertices 0..V-1
+# and no loops; the same seed always gives the same graph.
+
+def random_edges(n_edges: int, seed: int):
+    """
+    Uniform random graph with an average out-degree of 4.
+    """
+    rng = random.Random(seed)
+    v_count = max(2, n_edges // 4)
+    edges = []
+    while len(edges) < n_edges:
+        u, v = rng.randrange(v_count), rng.randrange(v_count)
+        if u != v:
+            edges.append((u, v, rng.randint(1, 20)))
+    return v_count, edges
+
+
+def grid_edges(n_edges: int, seed: int):
+    """
+    Square grid with an edge to the right and one downwards from every cell.
+    """
+    rng = random.Random(seed)
+    side = max(2, math.isqrt(n_edges // 2) + 1)
+    edges = []
+    for row in range(side):
+        for col in range(side):
+            v = row * side + col
+            if col + 1 < side:
+                edges.append((v, v + 1, rng.randint(1, 20)))
+            if row + 1 < side:
+                edges.append((v, v + side, rng.randint(1, 20)))
+    return side * side, edges[:n_edges]
+
+
+def power_law_edges(n_edges: int, seed: int, per_vertex: int = 4):
+    """
+    Preferential attachment (Barabasi-Albert): each new vertex links to per_vertex existing ones, picked
+    with probability proportional to their degree, giving a power-law degree distribution. Edges point from
+    the older vertex to the newer one, so the early hubs (vertex 0 among them) reach most of the graph.
+    """
+    rng = random.Random(seed)
+    v_count = max(per_vertex + 1, n_edges // per_vertex + 1)
+    endpoints = list(range(per_vertex))
+    edges = []
+    for v in range(per_vertex, v_count):
+        targets = set()
+        while len(targets) < per_vertex:
+            targets.add(rng.choice(endpoints))
+        for u in targets:
+            edges.append((u, v, rng.randint(1, 20)))
+            endpoints.extend((u, v))
+    return v_count, edges[:n_edges]
+
+
+def chain_edges(n_edges: int, seed: int):
+    """
+    A single path 0 -> 1 -> ... -> n_edges.
+    """
+    rng = random.Random(seed)
+    return n_edges + 1, [(i, i + 1, rng.randint(1, 20)) for i in range(n_edges)]
+
+
+GENERATORS = {'random': random_edges, 'grid': grid_edges, 'power_law': power_law_edges, 'chain': chain_edges}
+
+
+# ------------------------------------------------------------------ #
+# Benchmarks. Each takes (graph, ctx) where ctx holds seeded sample vertices, pairs and paths
+# prepared outside the timed region. Benchmarks that mutate the graph or leave query state behind
+# (a cached topological order) get a fresh graph for every repeat.
+
+def _walks(edges: [], v_count: int, rng, count: int, length: int = 8) -> []:
+    """
+    Return count random walks of up to length vertices along edges (valid paths, for is_valid_path).
+    """
+    out = [[] for _ in range(v_count)]
+    for src, dst, _ in edges:
+        out[src].append(dst)
+    walks = []
+    for _ in range(count):
+        walk = [rng.randrange(v_count)]
+        for _ in range(length - 1):
+            successors = out[walk[-1]]
+            if not successors:
+                break
+            walk.append(rng.choice(successors))
+        walks.append(walk)
+    return walks
+
+
+def _save_load(graph, ctx) -> None:
+    path = os.path.join(ctx['tmp'], 'bench.snapshot')
+    graph.save(path)
+    type(graph).load(path)
+
+
+def _save_load_landmarks(graph, ctx) -> None:
+    path = os.path.join(ctx['tmp'], 'bench.landmarks')
+    graph.save_landmarks(path)
+    graph.load_landmarks(path)
+
+
+def _zero(v: int, dst: int) -> int:
+    """
+    Heuristic for a_star that never overestimates, so the explicit-heuristic path is timed on any graph.
+    """
+    return 0
+
+
+def _write_edge_file(path: str, edges: []) -> str:
+    """
+    Write edges as whitespace-separated edge-list lines for from_edge_file and return path.
+    """
+    with open(path, 'w') as file:
+        for edge in edges:
+            file.write(' '.join(map(str, edge)) + '\n')
+    return path
+
+
+def _remove_and_compact(graph, ctx) -> None:
+    for v in ctx['vertices'][:100]:
+        graph.remove_vertex(v)
+    graph.compact()
+
+
+def _would_create_cycle(graph, ctx) -> None:
+    for u, v in ctx['pairs'][:10]:
+        graph.would_create_cycle(u, v)
+
+
+DIRECTED_BENCHMARKS = {
+    'add_vertex': (True, None, lambda g, c: [g.add_vertex() for _ in range(100)]),
+    'add_edge': (True, None, lambda g, c: [g.add_edge(u, v, 7) for u, v in c['pairs']]),
+    'remove_edge': (True, None, lambda g, c: [g.remove_edge(u, v) for u, v, _ in c['edges']]),
+    'remove_vertex': (True, None, lambda g, c: [g.remove_vertex(v) for v in c['vertices'][:100]]),
+    'remove_vertex_compact': (True, None, _remove_and_compact),
+    'add_edges_bulk': (True, None, lambda g, c: type(g).sparse().add_edges_bulk(c['all_edges'])),
+    'from_edge_file': (False, None, lambda g, c: type(g).from_edge_file(c['edge_file'], g.storage)),
+    'set_storage': (True, _DENSE_MAX_VERTICES,
+                    lambda g, c: g.set_storage('dense' if g.storage == 'sparse' else 'sparse')),
+    'get_vertices': (False, None, lambda g, c: g.get_vertices()),
+    'get_edges': (False, None, lambda g, c: g.get_edges()),
+    'is_valid_path': (False, None, lambda g, c: [g.is_valid_path(p) for p in c['paths']]),
+    'validate_paths': (False, None, lambda g, c: g.validate_paths(c['paths'])),
+    'dfs': (False, None, lambda g, c: g.dfs(c['source'])),
+    'bfs': (False, None, lambda g, c: g.bfs(c['source'])),
+    'iter_dfs_first_100': (False, None, lambda g, c: [v for v, _ in zip(g.iter_dfs(c['source']), range(100))]),
+    'iter_bfs_first_100': (False, None, lambda g, c: [v for v, _ in zip(g.iter_bfs(c['source']), range(100))]),
+    'has_cycle': (True, None, lambda g, c: g.has_cycle()),
+    'track_order': (True, None, lambda g, c: g.track_order()),
+    'would_create_cycle': (True, None, _would_create_cycle),
+    'would_create_cycle_tracked': (False, None,
+                                   lambda g, c: [c['tracked'].would_create_cycle(u, v) for u, v in c['pairs'][:100]]),
+    'dijkstra': (True, None, lambda g, c: g.dijkstra(c['source'])),
+    'dijkstra_heap': (False, None, lambda g, c: g.dijkstra(c['source'], engine='heap')),
+    'dijkstra_bucket': (False, None, lambda g, c: g.dijkstra(c['source'], engine='bucket')),
+    'dijkstra_to_target': (False, None, lambda g, c: [g.dijkstra(u, v) for u, v in c['pairs'][:10]]),
+    'dijkstra_tree': (False, None, lambda g, c: g.dijkstra_tree(c['source'])),
+    'shortest_path': (False, None, lambda g, c: [g.shortest_path(u, v) for u, v in c['pairs'][:10]]),
+    'multi_source_bfs': (False, None, lambda g, c: g.multi_source_bfs(c['vertices'][:64], 3)),
+    'is_reachable': (False, None, lambda g, c: [g.is_reachable(u, v) for u, v in c['pairs'][:10]]),
+    'is_reachable_tracked': (False, _REACH_MAX_VERTICES,
+                             lambda g, c: [c['tracked'].is_reachable(u, v) for u, v in c['pairs']]),
+    'track_reachability': (True, _REACH_MAX_VERTICES, lambda g, c: g.track_reachability()),
+    'topological_order': ('dag', None, lambda g, c: g.topological_order()),
+    'dag_shortest_paths': ('dag', None, lambda g, c: g.dag_shortest_paths(c['source'])),
+    'dag_longest_path': ('dag', None, lambda g, c: g.dag_longest_path()),
+    'build_landmarks': (False, None, lambda g, c: g.build_landmarks(4, seed=0)),
+    'save_load_landmarks': (False, None, _save_load_landmarks),
+    'a_star_landmarks': (False, None, lambda g, c: [g.a_star(u, v) for u, v in c['pairs'][:10]]),
+    'a_star_heuristic': (False, None, lambda g, c: [g.a_star(u, v, _zero) for u, v in c['pairs'][:10]]),
+    'all_pairs_shortest_paths': (False, 2000, lambda g, c: g.all_pairs_shortest_paths()),
+    'save_load': (False, None, _save_load),
+    'publish': (True, None, lambda g, c: g.publish()),
+}
+
+UNDIRECTED_BENCHMARKS = {
+    'add_vertex': (True, None, lambda g, c: [g.add_vertex(f'new{i}') for i in range(100)]),
+    'add_edge': (True, None, lambda g, c: [g.add_edge(u, v) for u, v in c['pairs']]),
+    'remove_edge': (True, None, lambda g, c: [g.remove_edge(u, v) for u, v in c['edges']]),
+    'remove_vertex': (True, None, lambda g, c: [g.remove_vertex(v) for v in c['vertices'][:100]]),
+    'add_edges_bulk': (True, None, lambda g, c: type(g)().add_edges_bulk(c['all_edges'])),
+    'add_edges_bulk_compact': (True, None, lambda g, c: type(g).compact_graph().add_edges_bulk(c['all_edges'])),
+    'from_edge_file': (False, None, lambda g, c: type(g).from_edge_file(c['edge_file'])),
+    'set_storage_compact': (True, None, lambda g, c: g.set_storage('compact')),
+    'get_vertices': (False, None, lambda g, c: g.get_vertices()),
+    'get_edges': (False, None, lambda g, c: g.get_edges()),
+    'iter_edges': (False, None, lambda g, c: collections.deque(g.iter_edges(), maxlen=0)),
+    'is_valid_path': (False, None, lambda g, c: [g.is_valid_path(p) for p in c['paths']]),
+    'validate_paths': (False, None, lambda g, c: g.validate_paths(c['paths'])),
+    'dfs': (False, None, lambda g, c: g.dfs(c['source'])),
+    'bfs': (False, None, lambda g, c: g.bfs(c['source'])),
+    'iter_dfs_first_100': (False, None, lambda g, c: [v for v, _ in zip(g.iter_dfs(c['source']), range(100))]),
+    'iter_bfs_first_100': (False, None, lambda g, c: [v for v, _ in zip(g.iter_bfs(c['source']), range(100))]),
+    'count_connected_components': (False, None, lambda g, c: g.count_connected_components()),
+    'track_components': (True, None, lambda g, c: g.track_components()),
+    'same_component': (False, None, lambda g, c: [g.same_component(u, v) for u, v in c['pairs'][:10]]),
+    'same_component_tracked': (False, None, lambda g, c: [c['tracked'].same_component(u, v) for u, v in c['pairs']]),
+    'has_cycle': (False, None, lambda g, c: g.has_cycle()),
+    'multi_source_bfs': (False, None, lambda g, c: g.multi_source_bfs(c['vertices'][:64], 3)),
+    'shortest_path': (False, None, lambda g, c: [g.shortest_path(u, v) for u, v in c['pairs'][:100]]),
+    'shortest_paths': (False, None, lambda g, c: g.shortest_paths(c['pairs'][:100])),
+    'save_load': (False, None, _save_load),
+    'publish': (True, None, lambda g, c: g.publish()),
+}
+
+
+def _directed_graph(v_count: int, edges, storage: str = 'sparse') -> DirectedGraph:
+    """
+    Return a DirectedGraph with v_count vertices and edges, built through the public bulk API.
+    """
+    graph = DirectedGraph.sparse()
+    graph.add_edges_bulk(edges)
+    while graph.v_count < v_count:      # isolated vertices past the last endpoint
+        graph.add_vertex()
+    graph.set_storage(storage)
+    return graph
+
+
+def _directed_setup(v_count: int, edges: [], rng, storage: str):
+    """
+    Return a factory for the benchmark DirectedGraph and its query context.
+    """
+    def build():
+        return _directed_graph(v_count, edges, storage)
+
+    def build_dag():                    # the same edges, each pointed from the lower id to the higher
+        return _directed_graph(v_count, ((min(src, dst), max(src, dst), weight) for src, dst, weight in edges),
+                               storage)
+
+    graph = build()
+    graph.build_landmarks(4, seed=0)
+    tracked = build()                   # the same graph with the O(1) query indexes on
+    tracked.track_order()
+    if v_count <= _REACH_MAX_VERTICES:
+        tracked.track_reachability()
+    ctx = {
+        'source': 0,
+        'vertices': rng.sample(range(v_count), min(v_count, _OPS)),
+        'pairs': [(rng.randrange(v_count), rng.randrange(v_count)) for _ in range(_OPS)],
+        'edges': rng.sample(edges, min(len(edges), _OPS)),
+        'paths': _walks(edges, v_count, rng, _OPS // 10),
+        'all_edges': edges,
+        'build_dag': build_dag,
+        'tracked': tracked,
+    }
+    return build, graph, ctx
+
+
+def _undirected_setup(v_count: int, edges: [], rng):
+    """
+    Return a factory for the benchmark UndirectedGraph (vertex names are the ids as strings) and its context.
+    """
+    named = [(str(u), str(v)) for u, v, _ in edges]
+
+    def build():
+        graph = UndirectedGraph()
+        graph.add_edges_bulk(named)
+        return graph
+
+    graph = build()
+    tracked = build()
+    tracked.track_components()
+    names = graph.get_vertices()
+    ctx = {
+        'source': names[0] if names else None,
+        'vertices': rng.sample(names, min(len(names), _OPS)),
+        'pairs': [(rng.choice(names), rng.choice(names)) for _ in range(_OPS)],
+        'edges': rng.sample(named, min(len(named), _OPS)),
+        'paths': [_walk_names(graph, rng) for _ in range(_OPS // 10)],
+        'all_edges': named,
+        'tracked': tracked,
+    }
+    return build, graph, ctx
+
+
+def _walk_names(graph, rng, length: int = 8) -> []:
+    """
+    Return one random walk through an UndirectedGraph.
+    """
+    walk = [rng.choice(list(graph.adj_list))] if graph.adj_list else []
+    while walk and len(walk) < length and graph.adj_list[walk[-1]]:
+        walk.append(rng.choice(graph.adj_list[walk[-1]].copy()))
+    return walk
+
+
+def _measure(build, graph, ctx, run, fresh, repeat: int) -> dict:
+    """
+    Return the best wall time over repeat runs and the peak traced memory of one extra run. fresh is False
+    to run on the shared graph, True to run on a new one from build each time, or 'dag' for a new copy of
+    the acyclic graph from ctx['build_dag'].
+    """
+    def make():
+        if fresh == 'dag':
+            return ctx['build_dag']()
+        return build() if fresh else graph
+
+    best = float('inf')
+    for _ in range(repeat):
+        target = make()
+        gc.collect()
+        start = time.perf_counter()
+        run(target, ctx)
+        best = min(best, time.perf_counter() - start)
+
+    target = make()
+    gc.collect()
+    tracemalloc.start()
+    run(target, ctx)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seconds': best, 'peak_bytes': peak}
+
+
+def run_suite(sizes: [], generators: [], seed: int = 0, repeat: int = 3, storage: str = 'sparse',
+              only: [] = None) -> dict:
+    """
+    Run every benchmark on every generated graph and return the results as a JSON-ready dict.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for generator in generators:
+            for size in sizes:
+                v_count, edges = GENERATORS[generator](size, seed)
+                rng = random.Random(seed)
+                suites = []
+                if storage in ('dense', 'numpy') and v_count > _DENSE_MAX_VERTICES:
+                    print(f'skipping DirectedGraph on {generator}/{size}: too many vertices for {storage}',
+                          file=sys.stderr)
+                else:
+                    suites.append(('DirectedGraph', DIRECTED_BENCHMARKS,
+                                   _directed_setup(v_count, edges, rng, storage)))
+                suites.append(('UndirectedGraph', UNDIRECTED_BENCHMARKS, _undirected_setup(v_count, edges, rng)))
+                for graph_name, benchmarks, (build, graph, ctx) in suites:
+                    ctx['tmp'] = tmp
+                    ctx['edge_file'] = _write_edge_file(os.path.join(tmp, f'{graph_name}.edges'), ctx['all_edges'])
+                    for method, (fresh, max_vertices, run) in benchmarks.items():
+                        if only and method not in only:
+                            continue
+                        if max_vertices is not None and v_count > max_vertices:
+                            continue
+                        measured = _measure(build, graph, ctx, run, fresh, repeat)
+                        results.append({'graph': graph_name, 'method': method, 'generator': generator,
+                                        'edges': len(edges), 'vertices': v_count, **measured})
+                        print(f'{graph_name:16} {method:28} {generator:10} {len(edges):>9} '
+                              f'{measured["seconds"]:10.5f}s {measured["peak_bytes"] / 1e6:9.2f}MB', file=sys.stderr)
+    _check_compact_memory(results)
+    return {'meta': {'seed': seed, 'repeat': repeat, 'storage': storage, 'python': sys.version.split()[0],
+                     'platform': platform.platform(), 'created': time.strftime('%Y-%m-%dT%H:%M:%S')},
+            'results': results}
+
+
+def _check_compact_memory(results: []) -> None:
+    """
+    Record on every add_edges_bulk_compact result its peak memory relative to add_edges_bulk on 'list'
+    storage for the same graph (peak_vs_list), and warn when compact storage is not the smaller one.
+    """
+    def key(result):
+        return result['graph'], result['generator'], result['edges']
+
+    listed = {key(result): result for result in results if result['method'] == 'add_edges_bulk'}
+    for result in results:
+        baseline = listed.get(key(result))
+        if result['method'] != 'add_edges_bulk_compact' or baseline is None:
+            continue
+        result['peak_vs_list'] = result['peak_bytes'] / max(baseline['peak_bytes'], 1)
+        if result['peak_vs_list'] >= 1:
+            print(f'WARNING compact storage peaks at {result["peak_bytes"] / 1e6:.2f}MB, list storage at '
+                  f'{baseline["peak_bytes"] / 1e6:.2f}MB [{result["generator"]}, {result["edges"]} edges]',
+                  file=sys.stderr)
+
+
+def dijkstra_crossover(n_edges: int, generators: [], weights: [], seed: int = 0, repeat: int = 3) -> []:
+    """
+    Time the heap and bucket-queue Dijkstra engines on each generated graph with its weights redrawn
+    uniformly from 1..max_weight, for every max_weight in weights. Returns one row per (generator, max_weight);
+    the crossover is the max_weight where speedup (heap time / bucket time) drops below 1.
+    """
+    rows = []
+    for generator in generators:
+        v_count, edges = GENERATORS[generator](n_edges, seed)
+        for max_weight in weights:
+            rng = random.Random(seed)
+            graph = _directed_graph(v_count, ((src, dst, rng.randint(1, max_weight)) for src, dst, _ in edges))
+            graph.dijkstra(0, engine='bucket')      # the first bucket run also scans the weights; keep it untimed
+            timings = {}
+            for engine in ('heap', 'bucket'):
+                best = float('inf')
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    graph.dijkstra(0, engine=engine)
+                    best = min(best, time.perf_counter() - start)
+                timings[engine] = best
+            rows.append({'generator': generator, 'edges': len(edges), 'max_weight': max_weight, **timings,
+                         'speedup': timings['heap'] / timings['bucket']})
+            print(f'{generator:10} {len(edges):>9} max weight {max_weight:>6}  heap {timings["heap"]:9.5f}s  '
+                  f'bucket {timings["bucket"]:9.5f}s  {rows[-1]["speedup"]:5.2f}x', file=sys.stderr)
+    return rows
+
+
+def compare(old: dict, new: dict, threshold: float = 1.25, min_seconds: float = 1e-4) -> []:
+    """
+    Return (key, metric, old, new, ratio) for every benchmark whose time or peak memory grew by more than
+    threshold times between two runs. Timings under min_seconds in both runs are too noisy to judge.
+    """
+    def key(result):
+        return result['graph'], result['method'], result['generator'], result['edges']
+
+    before = {key(result): result for result in old['results']}
+    regressions = []
+    for result in new['results']:
+        previous = before.get(key(result))
+        if previous is None:
+            continue
+        for metric, floor in (('seconds', min_seconds), ('peak_bytes', 1024)):
+            if max(previous[metric], result[metric]) < floor:
+                continue
+            ratio = result[metric] / max(previous[metric], 1e-12)
+            if ratio > threshold:
+                regressions.append((key(result), metric, previous[metric], result[metric], ratio))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmarks and write JSON results')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='edge counts')
+    run_parser.add_argument('--generators', nargs='+', default=list(GENERATORS), choices=list(GENERATORS))
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--storage', default='sparse', choices=['dense', 'numpy', 'sparse'],
+                            help='DirectedGraph storage backend')
+    run_parser.add_argument('--only', nargs='+', help='run only these methods')
+    run_parser.add_argument('--out', default='-', help="output file ('-' for stdout)")
+
+    compare_parser = commands.add_parser('compare', help='flag regressions between two result files')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio to flag')
+
+    crossover_parser = commands.add_parser('crossover', help='heap vs bucket-queue Dijkstra across weight ranges')
+    crossover_parser.add_argument('--edges', type=int, default=100000)
+    crossover_parser.add_argument('--generators', nargs='+', default=list(GENERATORS), choices=list(GENERATORS))
+    crossover_parser.add_argument('--weights', type=int, nargs='+', default=[1, 4, 16, 64, 256, 1024, 4096])
+    crossover_parser.add_argument('--seed', type=int, default=0)
+    crossover_parser.add_argument('--repeat', type=int, default=3)
+
+    args = parser.parse_args(argv)
+    if args.command == 'crossover':
+        rows = dijkstra_crossover(args.edges, args.generators, args.weights, args.seed, args.repeat)
+        json.dump(rows, sys.stdout, indent=1)
+        return 0
+    if args.command == 'run':
+        results = run_suite(args.sizes, args.generators, args.seed, args.repeat, args.storage, args.only)
+        if args.out == '-':
+            json.dump(results, sys.stdout, indent=1)
+        else:
+            with open(args.out, 'w') as file:
+                json.dump(results, file, indent=1)
+        return 0
+
+    with open(args.old) as file:
+        old = json.load(file)
+    with open(args.new) as file:
+        new = json.load(file)
+    regressions = compare(old, new, args.threshold)
+    for (graph, method, generator, edges), metric, before, after, ratio in regressions:
+        print(f'REGRESSION {graph}.{method} [{generator}, {edges} edges] {metric}: {before:.6g} -> {after:.6g} '
+              f'({ratio:.2f}x)')
+    if not regressions:
+        print('no regressions')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# Course: CS261 - Data Structures
+# Author: Nelsyda Perez
+# Assignment: 6 - Graph Implementation
+# Description: Versioned LRU cache for graph query results
+
+import functools
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class QueryCache:
+    """
+    LRU cache of query results for one graph version, bounded both by entry count (maxsize) and by
+    estimated memory: the total length of the cached results (list slots, one per vertex for dfs, bfs and
+    dijkstra) stays within max_items. A result longer than max_items on its own is not cached.
+    Looking up or storing a result for a newer version drops every older entry.
+    """
+    __slots__ = ('maxsize', 'max_items', 'items', 'version', 'hits', 'misses', 'evictions', 'invalidations',
+                 '_entries')
+
+    def __init__(self, maxsize: int = 1024, max_items: int = 1 << 22):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self.max_items = max_items
+        self.items = 0          # total estimated size of the cached results
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, version):
+        """
+        Return the result stored for key at version, or _MISSING.
+        """
+        self._sync(version)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return _MISSING
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, version, result) -> None:
+        """
+        Store result for key at version, evicting the least recently used entries until both bounds hold.
+        """
+        self._sync(version)
+        size = len(result) if hasattr(result, '__len__') else 1
+        if size > self.max_items:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.items -= old[1]
+        self._entries[key] = (result, size)
+        self.items += size
+        while len(self._entries) > self.maxsize or self.items > self.max_items:
+            self.items -= self._entries.popitem(last=False)[1][1]
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drop every entry and reset the counters.
+        """
+        self._entries.clear()
+        self.items = 0
+        self.version = None
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict:
+        """
+        Return a snapshot of the cache counters.
+        """
+        return {'size': len(self._entries), 'maxsize': self.maxsize, 'items': self.items,
+                'max_items': self.max_items, 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'invalidations': self.invalidations}
+
+    def _sync(self, version) -> None:
+        """
+        Drop all entries if they were computed for another graph version.
+        """
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+                self.items = 0
+            self.version = version
+
+
+class QueryCacheMixin:
+    """
+    Opt-in query cache shared by the graph ADTs. Methods decorated with cached_query are cached while it
+    is on; every mutating method must bump _version.
+    """
+    # Opt-in query cache (see enable_cache); _version is bumped by every mutating method
+    _cache = None
+    _version = 0
+
+    def enable_cache(self, maxsize: int = 1024, max_items: int = 1 << 22) -> None:
+        """
+        Cache the results of dfs, bfs and (on DirectedGraph) dijkstra (LRU, at most maxsize entries holding
+        at most max_items list slots in total) until the graph changes.
+        """
+        self._cache = QueryCache(maxsize, max_items)
+
+    def disable_cache(self) -> None:
+        """
+        Stop caching query results and free the cache.
+        """
+        self._cache = None
+
+    def cache_stats(self) -> dict:
+        """
+        Return the query cache counters (hits, misses, evictions, ...), or an empty dict if caching is off.
+        """
+        if self._cache is None:
+            return {}
+        return self._cache.stats()
+
+
+def cached_query(method):
+    """
+    Decorator for graph query methods. When the graph has a QueryCache in _cache, results are looked up by
+    (method name, arguments) against the graph's _version; otherwise the method runs as is.
+    List results are copied on the way out so callers cannot modify the cached value.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self._cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+        key = (name, args, tuple(sorted(kwargs.items()))) if kwargs else (name, args)
+        result = cache.get(key, self._version)
+        if result is _MISSING:
+            result = method(self, *args, **kwargs)
+            cache.put(key, self._version, result)
+        if isinstance(result, list):
+            return list(result)
+        return result
+
+    return wrapper
@@ -0,0 +1,160 @@
+# Course: CS261 - Data Structures
+# Author: Nelsyda Perez
+# Assignment: 6 - Graph Implementation
+# Description: Incremental connected component tracking for the undirected graph ADT
+
+from collections import deque
+
+
+class ComponentTracker:
+    """
+    Keeps the connected components of an undirected adjacency list up to date as it changes.
+    Every vertex carries the id of its component and every component keeps its member set, so
+    count() and same() are O(1). Joining two components relabels the smaller one (weighted union),
+    and removing an edge or vertex only searches the component it was in to find the pieces that
+    split off.
+    """
+    __slots__ = ('_adj_list', '_label', '_members', '_next_id')
+
+    def __init__(self, adj_list: dict):
+        self._adj_list = adj_list
+        self._label = {}
+        self._members = {}
+        self._next_id = 0
+        for vertex in adj_list:
+            if vertex in self._label:
+                continue
+            members = {vertex}
+            queue = deque([vertex])
+            while queue:
+                for adjacent in adj_list[queue.popleft()]:
+                    if adjacent not in members:
+                        members.add(adjacent)
+                        queue.append(adjacent)
+            self._new_component(members)
+
+    def count(self) -> int:
+        """
+        Return number of connected components.
+        """
+        return len(self._members)
+
+    def same(self, u, v) -> bool:
+        """
+        Return True if u and v are both tracked and in the same component.
+        """
+        label = self._label.get(u)
+        return label is not None and label == self._label.get(v)
+
+    def add_vertex(self, v) -> None:
+        """
+        Track v as a component of its own if it is new.
+        """
+        if v not in self._label:
+            self._new_component({v})
+
+    def add_edge(self, u, v) -> None:
+        """
+        Merge the components of u and v (adding either vertex if it is new).
+        """
+        self.add_vertex(u)
+        self.add_vertex(v)
+        first, second = self._label[u], self._label[v]
+        if first == second:
+            return
+        if len(self._members[first]) < len(self._members[second]):
+            first, second = second, first
+        moved = self._members.pop(second)
+        for vertex in moved:
+            self._label[vertex] = first
+        self._members[first] |= moved
+
+    def remove_edge(self, u, v) -> None:
+        """
+        Update components after edge u-v was removed from the adjacency list.
+        """
+        self._split([u, v])
+
+    def remove_vertex(self, v, neighbors) -> None:
+        """
+        Update components after v and its edges to neighbors were removed from the adjacency list.
+        """
+        label = self._label.pop(v, None)
+        if label is None:
+            return
+        members = self._members[label]
+        members.discard(v)
+        if not members:
+            del self._members[label]
+        self._split(list(neighbors))
+
+    def _new_component(self, members: set) -> int:
+        """
+        Register members as a new component and return its id.
+        """
+        label = self._next_id
+        self._next_id += 1
+        self._members[label] = members
+        for vertex in members:
+            self._label[vertex] = label
+        return label
+
+    def _split(self, seeds: []) -> None:
+        """
+        Given vertices that were all in one component before an edge or vertex was removed, find which of
+        them are no longer connected. One search runs per seed, in lockstep; searches that meet are merged.
+        Each search that runs out of vertices has found a piece that split off and is relabeled. Once a
+        single search is left it is the remainder, which keeps the old label without being fully explored.
+        """
+        searches = []      # [frontier, members] per search, None once merged into another
+        owner = {}
+        for seed in seeds:
+            if seed not in owner:
+                owner[seed] = len(searches)
+                searches.append([deque([seed]), {seed}])
+        parent = list(range(len(searches)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        active = list(range(len(searches)))
+        live = len(active)
+        while live > 1:
+            for i in active:
+                if searches[i] is None:
+                    continue
+                if live == 1:
+                    break
+                frontier, members = searches[i]
+                if not frontier:
+                    searches[i] = None
+                    live -= 1
+                    self._members[self._label[next(iter(members))]] -= members
+                    self._new_component(members)
+                    continue
+                for adjacent in self._adj_list[frontier.popleft()]:
+                    j = owner.get(adjacent)
+                    if j is None:
+                        owner[adjacent] = i
+                        members.add(adjacent)
+                        frontier.append(adjacent)
+                        continue
+                    j = find(j)
+                    if j == i:
+                        continue
+                    # Two searches met, so their seeds are still connected: fold the smaller into the larger
+                    other_frontier, other_members = searches[j]
+                    if len(other_members) > len(members):
+                        i, j = j, i
+                        frontier, members, other_frontier, other_members = \
+                            other_frontier, other_members, frontier, members
+                    members |= other_members
+                    frontier.extend(other_frontier)
+                    searches[i] = [frontier, members]
+                    searches[j] = None
+                    parent[j] = i
+                    live -= 1
+            active = [i for i in active if searches[i] is not None]
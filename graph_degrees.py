@@ -0,0 +1,73 @@
+# Course: CS261 - Data Structures
+# Author: Nelsyda Perez
+# Assignment: 6 - Graph Implementation
+# Description: Incrementally maintained size and degree statistics for the undirected graph ADT
+
+
+class DegreeTracker:
+    """
+    Vertex count, edge count and degree histogram (degree -> number of vertices) of an undirected
+    adjacency list. Counted once when created; after that the graph reports each change and every
+    update is O(1) per touched vertex. Hooks are called after the adjacency list has changed.
+    """
+    __slots__ = ('_adj_list', 'vertices', 'edges', 'histogram')
+
+    def __init__(self, adj_list: dict):
+        self._adj_list = adj_list
+        self.vertices = len(adj_list)
+        self.histogram = {}
+        degrees = 0
+        for vertex in adj_list:
+            degree = len(adj_list[vertex])
+            degrees += degree
+            self.histogram[degree] = self.histogram.get(degree, 0) + 1
+        self.edges = degrees // 2
+
+    def add_vertex(self) -> None:
+        """
+        Count a new isolated vertex.
+        """
+        self.vertices += 1
+        self._move(None, 0)
+
+    def add_edge(self, u, v) -> None:
+        """
+        Count the new edge u - v.
+        """
+        self.edges += 1
+        for vertex in (u, v):
+            degree = len(self._adj_list[vertex])
+            self._move(degree - 1, degree)
+
+    def remove_edge(self, u, v) -> None:
+        """
+        Uncount the removed edge u - v.
+        """
+        self.edges -= 1
+        for vertex in (u, v):
+            degree = len(self._adj_list[vertex])
+            self._move(degree + 1, degree)
+
+    def remove_vertex(self, neighbors) -> None:
+        """
+        Uncount a removed vertex that was adjacent to neighbors, along with its edges.
+        """
+        self.vertices -= 1
+        self.edges -= len(neighbors)
+        self._move(len(neighbors), None)
+        for vertex in neighbors:
+            degree = len(self._adj_list[vertex])
+            self._move(degree + 1, degree)
+
+    def _move(self, old, new) -> None:
+        """
+        Move one vertex from histogram bucket old to bucket new (None for no bucket).
+        """
+        histogram = self.histogram
+        if old is not None:
+            if histogram[old] == 1:
+                del histogram[old]
+            else:
+                histogram[old] -= 1
+        if new is not None:
+            histogram[new] = histogram.get(new, 0) + 1
@@ -0,0 +1,205 @@
+# Course: CS261 - Data Structures
+# Author: Nelsyda Perez
+# Assignment: 6 - Graph Implementation
+# Description: Reading and writing graph files for the undirected and directed graph ADTs
+
+import contextlib
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+
+from graph_storage import MixedWeights
+
+# Binary snapshot layout (native little-endian byte order, every section padded to 8 bytes):
+#   header        magic, format version, directed flag, weight code, vertex count, entry count, name bytes,
+#                 removed count
+#   name table    undirected only: int64 offsets (V + 1) into a UTF-8 blob of the vertex names
+#   offsets       int64 (V + 1): row i's entries are targets[offsets[i]:offsets[i + 1]]
+#   targets       int32 (entries): vertex ids
+#   weights       int64 or float64 (entries), directed only; with both int and float weights each entry is
+#                 the 8 bytes of either, followed by one uint8 flag per entry (1 for int64)
+#   removed       int64 (removed count): ids of removed vertices, directed only
+SNAPSHOT_MAGIC = b'GSNP'
+SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct('<4sHBBQQQQ')
+_WEIGHT_TYPES = {0: None, 1: 'q', 2: 'd', 3: 'q'}
+_MIXED_WEIGHTS = 3
+
+
+@contextlib.contextmanager
+def replacing(path: str):
+    """
+    Open a temporary file next to path for binary writing and, once the block finishes, flush it to disk
+    and rename it onto path. Readers that have the old file mapped keep its inode, so they never see it
+    truncated or half written. If the block raises, path is left untouched.
+    """
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                             prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            # mkstemp creates the file private to the owner; keep the permissions path had (or 0644)
+            try:
+                os.chmod(file.fileno(), os.stat(path).st_mode & 0o777)
+            except FileNotFoundError:
+                os.chmod(file.fileno(), 0o644)
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def iter_edge_file(path):
+    """
+    Yield the fields of each edge line in an edge-list file, one line at a time.
+    Fields may be separated by commas (CSV) or whitespace. Blank lines and lines
+    starting with '#' or '%' are skipped.
+    """
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if not line or line[0] in '#%':
+                continue
+            if ',' in line:
+                yield [field.strip() for field in line.split(',')]
+            else:
+                yield line.split()
+
+
+def parse_weight(field: str):
+    """
+    Return field as an int if it is integral, otherwise as a float.
+    """
+    try:
+        return int(field)
+    except ValueError:
+        return float(field)
+
+
+def iter_batches(iterable, batch_size: int):
+    """
+    Yield lists of up to batch_size consecutive items from iterable.
+    """
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Snapshot:
+    """
+    Graph arrays read from a binary snapshot. offsets, targets and weights are memoryviews over the file
+    buffer (an mmap when loaded with use_mmap), so they are never copied. names is a list of vertex names
+    (undirected snapshots) or None. removed holds the ids of removed vertices (empty if there are none).
+    """
+    __slots__ = ('directed', 'v_count', 'names', 'offsets', 'targets', 'weights', 'removed', '_buffer')
+
+    def __init__(self, directed, v_count, names, offsets, targets, weights, removed, buffer):
+        self.directed = directed
+        self.v_count = v_count
+        self.names = names
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.removed = removed
+        self._buffer = buffer       # keeps the mmap open for as long as the views are in use
+
+
+def write_snapshot(path: str, directed: bool, offsets: array, targets: array, weights: array = None,
+                   names: [] = None, removed: [] = ()) -> None:
+    """
+    Write CSR arrays (and vertex names for undirected graphs, removed vertex ids for directed ones) to path
+    in the binary snapshot format. The file is replaced, not overwritten, so graphs mapped from it stay valid.
+    """
+    removed = array('q', sorted(removed))
+    name_offsets, blob = array('q', [0]), b''
+    if names is not None:
+        encoded = [name.encode('utf-8') for name in names]
+        for name in encoded:
+            name_offsets.append(name_offsets[-1] + len(name))
+        blob = b''.join(encoded)
+    weight_code = 0
+    sections = [offsets, targets]
+    if isinstance(weights, MixedWeights):
+        weight_code = _MIXED_WEIGHTS
+        sections += [weights.bits, weights.flags]
+    elif weights is not None:
+        weight_code = 1 if weights.typecode == 'q' else 2
+        sections.append(weights)
+    sections.append(removed)
+
+    with replacing(path) as file:
+        file.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, int(directed), weight_code,
+                                         len(offsets) - 1, len(targets), len(blob), len(removed)))
+        _pad(file)
+        if names is not None:
+            name_offsets.tofile(file)
+            file.write(blob)
+            _pad(file)
+        for section in sections:
+            section.tofile(file)
+            _pad(file)
+
+
+def read_snapshot(path: str, use_mmap: bool = True) -> Snapshot:
+    """
+    Read a snapshot written by write_snapshot. With use_mmap the file is mapped read-only and shared through
+    the page cache; otherwise it is read into memory once.
+    """
+    with open(path, 'rb') as file:
+        if use_mmap:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = file.read()
+    view = memoryview(buffer)
+    magic, version = struct.unpack_from('<4sH', view)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f'{path} is not a graph snapshot')
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f'{path} has snapshot format version {version}, expected {SNAPSHOT_VERSION}')
+    _, _, directed, weight_code, v_count, entries, name_bytes, removed_count = _SNAPSHOT_HEADER.unpack_from(view)
+
+    position = _aligned(_SNAPSHOT_HEADER.size)
+    names = None
+    if not directed:
+        name_offsets = view[position:position + 8 * (v_count + 1)].cast('q')
+        position += 8 * (v_count + 1)
+        blob = view[position:position + name_bytes]
+        names = [str(blob[name_offsets[i]:name_offsets[i + 1]], 'utf-8') for i in range(v_count)]
+        position = _aligned(position + name_bytes)
+
+    offsets = view[position:position + 8 * (v_count + 1)].cast('q')
+    position = _aligned(position + 8 * (v_count + 1))
+    targets = view[position:position + 4 * entries].cast('i')
+    position = _aligned(position + 4 * entries)
+    weights = None
+    if _WEIGHT_TYPES[weight_code] is not None:
+        weights = view[position:position + 8 * entries].cast(_WEIGHT_TYPES[weight_code])
+        position = _aligned(position + 8 * entries)
+        if weight_code == _MIXED_WEIGHTS:
+            weights = MixedWeights(weights, view[position:position + entries])
+            position = _aligned(position + entries)
+    removed = view[position:position + 8 * removed_count].cast('q')
+    return Snapshot(bool(directed), v_count, names, offsets, targets, weights, removed, buffer)
+
+
+def _aligned(position: int) -> int:
+    """
+    Round position up to a multiple of 8.
+    """
+    return (position + 7) & ~7
+
+
+def _pad(file) -> None:
+    """
+    Pad file with zero bytes up to the next multiple of 8.
+    """
+    file.write(bytes(_aligned(file.tell()) - file.tell()))
@@ -0,0 +1,117 @@
+# Course: CS261 - Data Structures
+# Author: Nelsyda Perez
+# Assignment: 6 - Graph Implementation
+# Description: Landmark distance index (ALT) for goal-directed search on the directed graph ADT
+
+import random
+import struct
+from array import array
+
+from graph_io import replacing
+
+_MAGIC = b'LMK1'
+_HEADER = struct.Struct('<4sII')    # magic, vertex count, landmark count
+
+
+class LandmarkIndex:
+    """
+    Shortest-path distances from and to K landmark vertices. By the triangle inequality these give an
+    admissible (and consistent) lower bound on the distance between any two vertices, for use as an A*
+    heuristic. version records the graph version the tables were computed for.
+    """
+    __slots__ = ('landmarks', 'dist_from', 'dist_to', 'version')
+
+    def __init__(self, landmarks: [], dist_from: [], dist_to: [], version=None):
+        self.landmarks = landmarks
+        self.dist_from = dist_from      # dist_from[k][v]: landmark k --> v
+        self.dist_to = dist_to          # dist_to[k][v]: v --> landmark k
+        self.version = version
+
+    @classmethod
+    def build(cls, graph, count: int, seed=None):
+        """
+        Pick up to count landmarks with the farthest-point rule (each new landmark is the vertex farthest
+        from those already picked) and run Dijkstra from each on the graph and on its reverse. Only live
+        vertices are candidates; removed ids reach nothing and would only look maximally far away.
+        """
+        n = graph.v_count
+        live = graph.get_vertices()
+        if not live:
+            return cls([], [], [], graph._version)
+        reverse = type(graph).sparse()
+        reverse._grow_to(n)
+        reverse.add_edges_bulk((dst, src, weight) for src, dst, weight in graph.get_edges())
+
+        inf = float('inf')
+        landmarks, dist_from, dist_to = [], [], []
+        closest = [inf] * n             # distance from the nearest landmark picked so far
+        landmark = random.Random(seed).choice(live)
+        while len(landmarks) < min(count, len(live)):
+            landmarks.append(landmark)
+            dist_from.append(array('d', graph._dijkstra(landmark)[0]))
+            dist_to.append(array('d', reverse._dijkstra(landmark)[0]))
+            farthest = -1
+            for v in live:
+                if dist_from[-1][v] < closest[v]:
+                    closest[v] = dist_from[-1][v]
+                # Vertices no landmark reaches are the best candidates of all
+                if v not in landmarks and (farthest < 0 or closest[v] > closest[farthest]):
+                    farthest = v
+            if farthest < 0:
+                break
+            landmark = farthest
+        return cls(landmarks, dist_from, dist_to, graph._version)
+
+    def bound_to(self, target: int):
+        """
+        Return a function v -> lower bound on the shortest distance from v to target, with the target's table
+        entries looked up once. Each landmark L gives d(v, t) >= d(v, L) - d(t, L) and d(v, t) >= d(L, t) - d(L, v).
+        """
+        inf = float('inf')
+        tables = [(to_k, to_k[target], 1) for to_k in self.dist_to if to_k[target] != inf]
+        tables += [(from_k, from_k[target], -1) for from_k in self.dist_from]
+
+        def bound(v):
+            best = 0
+            for table, anchor, sign in tables:
+                at_v = table[v]
+                if sign > 0:
+                    gap = at_v - anchor                 # d(v, L) - d(t, L)
+                elif at_v != inf:
+                    gap = anchor - at_v                 # d(L, t) - d(L, v)
+                else:
+                    continue
+                if gap > best:
+                    best = gap
+            return best
+
+        return bound
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to path in a small binary format (header, landmark ids, distance tables).
+        """
+        n = len(self.dist_from[0]) if self.dist_from else 0
+        with replacing(path) as file:
+            file.write(_HEADER.pack(_MAGIC, n, len(self.landmarks)))
+            array('q', self.landmarks).tofile(file)
+            for table in self.dist_from + self.dist_to:
+                table.tofile(file)
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Read an index written by save. The returned index has no graph version set.
+        """
+        with open(path, 'rb') as file:
+            magic, n, count = _HEADER.unpack(file.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f'{path} is not a landmark index file')
+            landmarks = array('q')
+            landmarks.fromfile(file, count)
+            tables = []
+            for _ in range(2 * count):
+                table = array('d')
+                table.fromfile(file, n)
+                tables.append(table)
+        return cls(list(landmarks), tables[:count], tables[count:])
@@ -0,0 +1,146 @@
+# Course: CS261 - Data Structures
+# Author: Nelsyda Perez
+# Assignment: 6 - Graph Implementation
+# Description: Incremental topological ordering (Pearce-Kelly) for the directed graph ADT
+
+
+class TopologicalOrder:
+    """
+    Keeps a topological order of a DirectedGraph while edges are added, so cycle checks are O(1).
+    Adding an edge that agrees with the current order costs nothing. Otherwise only the vertices
+    whose positions lie between the edge's endpoints are searched and reordered (Pearce-Kelly).
+    Once a cycle exists the order is dropped. A later remove_edge makes the state unknown, and the
+    next has_cycle rebuilds it from scratch.
+    """
+    __slots__ = ('_graph', 'position', 'order', '_preds', '_acyclic')
+
+    def __init__(self, graph):
+        self._graph = graph
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """
+        Recompute predecessor sets and the order from the graph (Kahn's algorithm, O(V + E)).
+        """
+        graph = self._graph
+        self._preds = [set() for _ in range(graph.v_count)]
+        for i in range(graph.v_count):
+            for j, _ in graph._successors(i):
+                self._preds[j].add(i)
+
+        in_degree = [len(preds) for preds in self._preds]
+        order = [i for i in range(graph.v_count) if in_degree[i] == 0]
+        for vertex in order:        # order grows while it is walked
+            for j, _ in graph._successors(vertex):
+                in_degree[j] -= 1
+                if in_degree[j] == 0:
+                    order.append(j)
+
+        self._acyclic = len(order) == graph.v_count
+        self.order = order if self._acyclic else []
+        self.position = [0] * graph.v_count
+        for index, vertex in enumerate(self.order):
+            self.position[vertex] = index
+
+    def has_cycle(self) -> bool:
+        """
+        Return True if the graph contains a cycle.
+        """
+        if self._acyclic is None:
+            self.rebuild()
+        return not self._acyclic
+
+    def known_acyclic(self) -> bool:
+        """
+        Return True if the graph is known to have no cycle, without rebuilding the order if the state is unknown.
+        """
+        return self._acyclic is True
+
+    def would_create_cycle(self, src: int, dst: int) -> bool:
+        """
+        Return True if the graph has a cycle, or would have one after adding edge src --> dst.
+        """
+        if self.has_cycle():
+            return True
+        if src == dst or self.position[dst] > self.position[src]:
+            return False
+        return self._forward(dst, src, self.position[src]) is None
+
+    def add_vertex(self) -> None:
+        """
+        Place a new isolated vertex at the end of the order.
+        """
+        self._preds.append(set())
+        self.position.append(len(self.order))
+        self.order.append(len(self.position) - 1)
+
+    def add_edge(self, src: int, dst: int) -> None:
+        """
+        Record edge src --> dst, reordering the affected region if the edge goes against the current order.
+        """
+        self._preds[dst].add(src)
+        if not self._acyclic:
+            return
+        lower, upper = self.position[dst], self.position[src]
+        if lower > upper:
+            return
+
+        forward = self._forward(dst, src, upper)
+        if forward is None:
+            self._acyclic = False
+            self.order = []
+            return
+        backward = self._backward(src, lower)
+
+        # Everything that must come after src moves behind everything that must come before dst,
+        # reusing the same set of positions
+        position = self.position
+        backward.sort(key=position.__getitem__)
+        forward.sort(key=position.__getitem__)
+        moved = backward + forward
+        slots = sorted(position[vertex] for vertex in moved)
+        for vertex, slot in zip(moved, slots):
+            position[vertex] = slot
+            self.order[slot] = vertex
+
+    def remove_edge(self, src: int, dst: int) -> None:
+        """
+        Record that edge src --> dst is gone. Any order stays valid; a known cycle may have been broken.
+        """
+        self._preds[dst].discard(src)
+        if self._acyclic is False:
+            self._acyclic = None
+
+    def _forward(self, start: int, target: int, upper: int):
+        """
+        Return the vertices reachable from start whose position is below upper, or None if target is reachable.
+        """
+        position = self.position
+        found = [start]
+        seen = {start}
+        stack = [start]
+        while stack:
+            for j, _ in self._graph._successors(stack.pop()):
+                if j == target:
+                    return None
+                if j not in seen and position[j] < upper:
+                    seen.add(j)
+                    found.append(j)
+                    stack.append(j)
+        return found
+
+    def _backward(self, start: int, lower: int) -> []:
+        """
+        Return the vertices that reach start whose position is above lower.
+        """
+        position = self.position
+        found = [start]
+        seen = {start}
+        stack = [start]
+        while stack:
+            for j in self._preds[stack.pop()]:
+                if j not in seen and position[j] > lower:
+                    seen.add(j)
+                    found.append(j)
+                    stack.append(j)
+        return found
@@ -0,0 +1,40 @@
+# Course: CS261 - Data Structures
+# Author: Nelsyda Perez
+# Assignment: 6 - Graph Implementation
+# Description: Input and output helpers for batched path validation on the graph ADTs
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:     # NumPy is optional; results fall back to bytearray / array('q')
+    np = None
+
+
+def flatten_paths(paths, offsets=None) -> tuple:
+    """
+    Return (hops, offsets) with path i being hops[offsets[i]:offsets[i + 1]].
+    paths is either an iterable of paths or, when offsets is given, already the flat sequence of hops.
+    """
+    if offsets is not None:
+        return paths, offsets
+    hops, offsets = [], array('q', [0])
+    for path in paths:
+        hops.extend(path)
+        offsets.append(len(hops))
+    return hops, offsets
+
+
+def path_results(first, with_first: bool):
+    """
+    Turn the per-path position of the first invalid vertex (-1 for valid paths) into validate_paths' result:
+    a boolean array of valid paths (NumPy bool, or a bytearray of 0/1 without NumPy), paired with the
+    positions (int64 array or array('q')) when with_first is set.
+    """
+    if np is not None:
+        first = np.asarray(first, dtype=np.int64)
+        valid = first < 0
+    else:
+        first = array('q', first)
+        valid = bytearray(position < 0 for position in first)
+    return (valid, first) if with_first else valid
@@ -0,0 +1,159 @@
+# Course: CS261 - Data Structures
+# Author: Nelsyda Perez
+# Assignment: 6 - Graph Implementation
+# Description: Transitive-closure reachability index for the directed graph ADT
+
+
+class ReachabilityIndex:
+    """
+    Answers "is there a path from u to v" in O(1). The graph is condensed into its strongly connected
+    components and every component gets a row in a bit matrix with one bit per component it reaches
+    (itself included), so the index takes about C^2 / 8 bytes for C components (a rebuild sizes the matrix
+    exactly; vertices added since grow it by a quarter at a time).
+    Adding an edge between two components ORs the target's row into every row that reaches the source.
+    An edge that merges components, or any removed edge, makes the index stale and the next query
+    rebuilds it from scratch.
+    """
+    __slots__ = ('_graph', 'component', 'count', '_capacity', '_stride', '_bits', '_stale')
+
+    def __init__(self, graph):
+        self._graph = graph
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """
+        Recompute the components (iterative Tarjan) and the closure rows (O(V + E) row ORs).
+        Tarjan finishes a component only after every component it reaches, so each row can be built
+        from rows that are already complete.
+        """
+        graph = self._graph
+        n = graph.v_count
+        index = [-1] * n
+        low = [0] * n
+        on_stack = bytearray(n)
+        stack = []
+        component = [-1] * n
+        closure = []
+        counter = 0
+
+        for root in range(n):
+            if index[root] >= 0:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [(root, iter(graph._neighbors(root)))]
+            while work:
+                vertex, adjacent_iter = work[-1]
+                for adjacent in adjacent_iter:
+                    if index[adjacent] < 0:
+                        index[adjacent] = low[adjacent] = counter
+                        counter += 1
+                        stack.append(adjacent)
+                        on_stack[adjacent] = 1
+                        work.append((adjacent, iter(graph._neighbors(adjacent))))
+                        break
+                    if on_stack[adjacent] and index[adjacent] < low[vertex]:
+                        low[vertex] = index[adjacent]
+                else:
+                    work.pop()
+                    if work and low[vertex] < low[work[-1][0]]:
+                        low[work[-1][0]] = low[vertex]
+                    if low[vertex] != index[vertex]:
+                        continue
+                    # vertex is the root of a component: pop its members and build its row
+                    label = len(closure)
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component[member] = label
+                        members.append(member)
+                        if member == vertex:
+                            break
+                    row = 1 << label
+                    for member in members:
+                        for adjacent in graph._neighbors(member):
+                            if component[adjacent] != label:
+                                row |= closure[component[adjacent]]
+                    closure.append(row)
+
+        self.component = component
+        self.count = len(closure)
+        self._pack(closure, self.count)
+        self._stale = False
+
+    def reaches(self, src: int, dst: int) -> bool:
+        """
+        Return True if dst can be reached from src (every vertex reaches itself).
+        """
+        if self._stale:
+            self.rebuild()
+        row, column = self.component[src], self.component[dst]
+        return bool(self._bits[row * self._stride + (column >> 3)] >> (column & 7) & 1)
+
+    def add_vertex(self) -> None:
+        """
+        Give a new isolated vertex its own component.
+        """
+        if self._stale:
+            return
+        label = self.count
+        if label == self._capacity:
+            # Grow by a quarter so vertices added one at a time cost amortized O(C) row copies
+            self._pack([self._row(c) for c in range(self.count)], self._capacity + max(8, self._capacity // 4))
+        self.component.append(label)
+        self.count += 1
+        self._bits[label * self._stride + (label >> 3)] |= 1 << (label & 7)
+
+    def add_edge(self, src: int, dst: int) -> None:
+        """
+        Record edge src --> dst.
+        """
+        if self._stale or self.reaches(src, dst):
+            return
+        if self.reaches(dst, src):
+            self._stale = True        # the edge merges every component on a dst --> src path
+            return
+        source, reached = self.component[src], self._row(self.component[dst])
+        offset, bit = source >> 3, 1 << (source & 7)
+        for row in range(self.count):
+            if self._bits[row * self._stride + offset] & bit:
+                self._set_row(row, self._row(row) | reached)
+
+    def remove_edge(self, src: int, dst: int) -> None:
+        """
+        Record that edge src --> dst is gone; the index is rebuilt on the next query.
+        """
+        self._stale = True
+
+    def nbytes(self) -> int:
+        """
+        Return the size of the component labels and the closure matrix in bytes.
+        """
+        return 8 * len(self.component) + len(self._bits)
+
+    def _row(self, label: int) -> int:
+        """
+        Return the closure row of component label as an integer bitset.
+        """
+        start = label * self._stride
+        return int.from_bytes(self._bits[start:start + self._stride], 'little')
+
+    def _set_row(self, label: int, row: int) -> None:
+        """
+        Store an integer bitset as the closure row of component label.
+        """
+        start = label * self._stride
+        self._bits[start:start + self._stride] = row.to_bytes(self._stride, 'little')
+
+    def _pack(self, rows: [], capacity: int) -> None:
+        """
+        Lay integer bitset rows out in a capacity x capacity bit matrix.
+        """
+        self._capacity = (capacity + 7) & ~7
+        self._stride = self._capacity >> 3
+        self._bits = bytearray(self._capacity * self._stride)
+        for label, row in enumerate(rows):
+            self._set_row(label, row)
@@ -0,0 +1,58 @@
+# Course: CS261 - Data Structures
+# Author: Nelsyda Perez
+# Assignment: 6 - Graph Implementation
+# Description: Published read-only snapshots for concurrent readers of the graph ADTs
+
+
+class SnapshotMixin:
+    """
+    publish/snapshot shared by the graph ADTs. A class using it provides _freeze(copy), which fills a new
+    empty graph with a read-only 'csr' copy of its own contents, and _WRITABLE_STORAGE, the backend a 'csr'
+    graph is converted to before its first change. Every mutating method calls _writable first.
+    """
+    # Read-only copy of the graph last frozen by publish(), handed to readers by snapshot()
+    _published = None
+    # Graph version a snapshot was taken at (None unless the graph came from publish)
+    version = None
+
+    def publish(self):
+        """
+        Freeze the current graph into a read-only 'csr' copy and make it the one snapshot() hands out.
+        The writer calls this after a batch of changes; the copy is built first and then swapped in with a
+        single attribute store, so readers see either the previous version or this one, never a mix.
+        Nothing is rebuilt if the graph has not changed since the last publish. Returns the snapshot.
+        """
+        published = self._published
+        if published is None or published.version != self._version:
+            published = type(self)()
+            self._freeze(published)
+            published.version = self._version
+            self._published = published
+        return published
+
+    def snapshot(self):
+        """
+        Return the last published read-only copy of the graph, or None if the writer has not published yet.
+        Readers never publish themselves: building the copy while the writer is changing the graph could mix
+        two versions.
+        dfs, bfs, has_cycle and the other queries run on it without any locking while the original keeps
+        changing; its version attribute is the graph version it was taken at. Snapshots are shared, so
+        changing one raises TypeError.
+        """
+        return self._published
+
+    def _check_unpublished(self) -> None:
+        """
+        Raise TypeError if this graph is a published snapshot, which readers share and nobody may change.
+        """
+        if self.version is not None:
+            raise TypeError('published graph snapshots are read-only')
+
+    def _writable(self) -> None:
+        """
+        Copy read-only 'csr' storage into _WRITABLE_STORAGE before the graph is first changed.
+        Published snapshots cannot be changed at all.
+        """
+        self._check_unpublished()
+        if self.storage == 'csr':
+            self.set_storage(self._WRITABLE_STORAGE)
@@ -0,0 +1,189 @@
+# Course: CS261 - Data Structures
+# Author: Nelsyda Perez
+# Assignment: 6 - Graph Implementation
+# Description: Opt-in per-operation work counters and latency histograms for the graph ADTs
+
+import functools
+import time
+
+# Latency bucket k counts calls that took less than 2**k microseconds (the last bucket is open-ended)
+_LATENCY_BUCKETS = 32
+
+
+class OperationStats:
+    """
+    Totals for one graph method: number of calls, time spent, work done and a latency histogram.
+    """
+    __slots__ = ('calls', 'seconds', 'max_seconds', 'vertices_popped', 'edges_scanned', 'heap_pushes',
+                 'heap_pops', 'max_depth', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.vertices_popped = 0
+        self.edges_scanned = 0
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.max_depth = 0
+        self.histogram = [0] * _LATENCY_BUCKETS
+
+    def observe(self, seconds: float) -> None:
+        """
+        Record one finished call that took seconds.
+        """
+        self.calls += 1
+        self.seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        bucket = int(seconds * 1e6).bit_length()
+        self.histogram[min(bucket, _LATENCY_BUCKETS - 1)] += 1
+
+    def as_dict(self) -> dict:
+        """
+        Return the totals as plain values. The histogram maps each bucket's upper bound in microseconds
+        (None for the open-ended last bucket) to its call count; empty buckets are left out.
+        """
+        histogram = {}
+        for bucket, count in enumerate(self.histogram):
+            if count:
+                histogram[2 ** bucket if bucket < _LATENCY_BUCKETS - 1 else None] = count
+        return {'calls': self.calls, 'seconds': self.seconds, 'max_seconds': self.max_seconds,
+                'vertices_popped': self.vertices_popped, 'edges_scanned': self.edges_scanned,
+                'heap_pushes': self.heap_pushes, 'heap_pops': self.heap_pops, 'max_depth': self.max_depth,
+                'latency_us': histogram}
+
+
+class GraphStats:
+    """
+    Per-method OperationStats for one graph. active is the OperationStats of the outermost instrumented
+    call in progress (None between calls); work counted while no call is in progress is dropped.
+    """
+    __slots__ = ('operations', 'active')
+
+    def __init__(self):
+        self.operations = {}
+        self.active = None
+
+    def record(self, popped: int = 0, scanned: int = 0, pushes: int = 0, pops: int = 0, depth: int = 0) -> None:
+        """
+        Add work done by the call in progress.
+        """
+        active = self.active
+        if active is None:
+            return
+        active.vertices_popped += popped
+        active.edges_scanned += scanned
+        active.heap_pushes += pushes
+        active.heap_pops += pops
+        if depth > active.max_depth:
+            active.max_depth = depth
+
+    def reach_depth(self, depth: int) -> None:
+        """
+        Note that the call in progress has a search path (recursion depth) of depth vertices.
+        """
+        active = self.active
+        if active is not None and depth > active.max_depth:
+            active.max_depth = depth
+
+    def counting(self, neighbors):
+        """
+        Wrap a neighbors(vertex) callable so every call counts one popped vertex and its edges as scanned.
+        """
+        def counted(vertex):
+            adjacent = neighbors(vertex)
+            active = self.active
+            if active is not None:
+                active.vertices_popped += 1
+                active.edges_scanned += len(adjacent)
+            return adjacent
+
+        return counted
+
+    def snapshot(self) -> dict:
+        """
+        Return method name -> counters for every method called so far.
+        """
+        return {name: operation.as_dict() for name, operation in self.operations.items()}
+
+    def reset(self) -> None:
+        """
+        Drop every counter and histogram.
+        """
+        self.operations.clear()
+
+
+class GraphStatsMixin:
+    """
+    Opt-in statistics shared by the graph ADTs: methods decorated with instrumented are timed, and
+    traversals wrap their neighbor lookups with _counted, while it is on.
+    """
+    # Opt-in per-method work counters and latency histograms (see enable_stats)
+    _stats = None
+
+    def enable_stats(self) -> None:
+        """
+        Start counting work (vertices popped, edges scanned, heap pushes and pops, search depth) and timing
+        calls per method. Already collected statistics are kept.
+        """
+        if self._stats is None:
+            self._stats = GraphStats()
+
+    def disable_stats(self) -> None:
+        """
+        Stop collecting statistics and drop the ones collected so far.
+        """
+        self._stats = None
+
+    def stats(self) -> dict:
+        """
+        Return method name -> counters and latency histogram for every instrumented method called since
+        enable_stats or reset_stats, or an empty dict if statistics are off.
+        """
+        if self._stats is None:
+            return {}
+        return self._stats.snapshot()
+
+    def reset_stats(self) -> None:
+        """
+        Zero every statistic collected so far without turning collection off.
+        """
+        if self._stats is not None:
+            self._stats.reset()
+
+    def _counted(self, neighbors):
+        """
+        Return neighbors, wrapped to count popped vertices and scanned edges while statistics are on.
+        """
+        if self._stats is None:
+            return neighbors
+        return self._stats.counting(neighbors)
+
+
+def instrumented(method):
+    """
+    Decorator for graph methods. When the graph has a GraphStats in _stats, each call is timed into the
+    method's OperationStats, which is also made active so the work counters below it land there;
+    otherwise the method runs as is. Instrumented methods called from inside another one are not
+    counted separately: their work adds to the outermost call, which alone is timed.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        stats = self._stats
+        if stats is None or stats.active is not None:
+            return method(self, *args, **kwargs)
+        operation = stats.operations.get(name)
+        if operation is None:
+            operation = stats.operations[name] = OperationStats()
+        stats.active = operation
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            operation.observe(time.perf_counter() - start)
+            stats.active = None
+
+    return wrapper
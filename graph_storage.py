@@ -0,0 +1,655 @@
+# Course: CS261 - Data Structures
+# Author: Nelsyda Perez
+# Assignment: 6 - Graph Implementation
+# Description: Alternate adjacency storage backends for the undirected and directed graph ADTs
+
+from array import array
+from bisect import bisect_left, insort
+from collections.abc import Mapping, MutableMapping
+
+_INDEX_MIN_DEGREE = 64      # degree from which CompactAdjacency binary-searches a sorted copy instead of scanning
+_ZEROS = array('i', [0])
+
+
+class SparseRow:
+    """
+    One row of a SparseMatrix. Only non-zero cells are stored (dst -> weight).
+    Reading a missing cell returns 0 and iterating yields the full dense row, so code
+    written against a list of lists (e.g. DirectedGraph.__str__) keeps working.
+    """
+    __slots__ = ('_cells', '_keys', '_matrix')
+
+    def __init__(self, matrix):
+        self._cells = {}
+        self._keys = None       # sorted dst cache, rebuilt lazily after the row changes
+        self._matrix = matrix
+
+    def __getitem__(self, dst):
+        return self._cells.get(dst, 0)
+
+    def __setitem__(self, dst, weight):
+        if weight == 0:
+            if self._cells.pop(dst, None) is not None:
+                self._keys = None
+            return
+        if dst not in self._cells:
+            self._keys = None
+        self._cells[dst] = weight
+
+    def __len__(self):
+        return len(self._matrix)
+
+    def __iter__(self):
+        cells = self._cells
+        return (cells.get(j, 0) for j in range(len(self._matrix)))
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def keys(self) -> []:
+        """
+        Return the dst of each non-zero cell in ascending order. The list is cached; do not modify it.
+        """
+        if self._keys is None:
+            self._keys = sorted(self._cells)
+        return self._keys
+
+    def items(self) -> []:
+        """
+        Return (dst, weight) pairs of the non-zero cells in ascending dst order.
+        """
+        if self._keys is None:
+            self._keys = sorted(self._cells)
+        cells = self._cells
+        return [(j, cells[j]) for j in self._keys]
+
+    def nnz(self) -> int:
+        """
+        Return number of non-zero cells in the row.
+        """
+        return len(self._cells)
+
+
+class SparseMatrix:
+    """
+    Adjacency matrix stored as one SparseRow per vertex.
+    Memory is O(V + E) and adding a vertex is O(1) since no existing row has to grow.
+    """
+    __slots__ = ('_rows',)
+
+    def __init__(self, v_count=0):
+        self._rows = [SparseRow(self) for _ in range(v_count)]
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        return self._rows[index]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def add_rows(self, count: int) -> None:
+        """
+        Append count empty rows at once.
+        """
+        self._rows.extend(SparseRow(self) for _ in range(count))
+
+    def nnz(self) -> int:
+        """
+        Return number of non-zero cells (edges) in the matrix.
+        """
+        return sum(row.nnz() for row in self._rows)
+
+
+class NeighborList:
+    """
+    Insertion-ordered set of adjacent vertices that reads like a list.
+    Membership tests, append and remove are O(1) instead of O(degree).
+    A sorted copy is built the first time sorted() is asked for and then kept in order by bisect
+    insertion and removal, so traversals get their alphabetical order without sorting on every visit.
+    """
+    __slots__ = ('_items', '_sorted')
+
+    def __init__(self, iterable=()):
+        self._items = dict.fromkeys(iterable)
+        self._sorted = None
+
+    def __contains__(self, v):
+        return v in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __reversed__(self):
+        return reversed(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return list(self._items)[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (NeighborList, list)):
+            return list(self._items) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self._items))
+
+    def append(self, v) -> None:
+        """
+        Add v at the end (no-op if v is already present).
+        """
+        if v in self._items:
+            return
+        self._items[v] = None
+        if self._sorted is not None:
+            try:
+                insort(self._sorted, v)
+            except TypeError:       # v does not compare with the other names; sort again when asked
+                self._sorted = None
+
+    def remove(self, v) -> None:
+        """
+        Remove v. Raises ValueError if v is not present, like list.remove.
+        """
+        try:
+            del self._items[v]
+        except KeyError:
+            raise ValueError(f'{v!r} not in neighbor list') from None
+        if self._sorted is not None:
+            del self._sorted[bisect_left(self._sorted, v)]
+
+    def discard(self, v) -> None:
+        """
+        Remove v if present.
+        """
+        if v in self._items:
+            self.remove(v)
+
+    def copy(self) -> []:
+        """
+        Return the neighbors as a new list.
+        """
+        return list(self._items)
+
+    def sorted(self) -> []:
+        """
+        Return the neighbors in ascending order. The list is kept up to date by append and remove; do not modify it.
+        """
+        if self._sorted is None:
+            self._sorted = sorted(self._items)
+        return self._sorted
+
+
+class CompactAdjacency(MutableMapping):
+    """
+    Memory-compact replacement for an adjacency list dict of vertex name -> neighbor list.
+    Names are interned to dense int ids and every vertex's neighbor ids live in one shared array('i') pool:
+    id i's neighbors are pool[start[i]:start[i] + degree[i]] in insertion order, in a block with room for
+    capacity[i] of them. A vertex that outgrows its block moves to the end of the pool with twice the room,
+    and the pool is rewritten without the abandoned blocks once they make up half of it, so there are no
+    per-vertex objects at all. Membership tests scan the block in C; vertices of degree _INDEX_MIN_DEGREE
+    and up get a sorted copy, built on first use, for binary search. Ids of removed vertices are recycled.
+    Assigning a neighbor that is not yet a vertex adds it with no neighbors, and deleting a vertex also
+    drops it from its neighbors' blocks so its id can be reused.
+    """
+    __slots__ = ('_ids', '_names', '_pool', '_start', '_degree', '_capacity', '_garbage', '_index', '_free')
+
+    def __init__(self, adj_list=None):
+        self._ids = {}              # name -> id, in vertex insertion order
+        self._names = []            # id -> name (None once recycled)
+        self._pool = array('i')     # every vertex's block of neighbor ids
+        self._start = array('q')    # id -> offset of its block in the pool
+        self._degree = array('i')   # id -> number of neighbors
+        self._capacity = array('i') # id -> slots reserved for its block
+        self._garbage = 0           # pool slots held by abandoned blocks
+        self._index = {}            # id -> sorted neighbor ids, only for high-degree vertices
+        self._free = []
+        if adj_list is not None:
+            for name in adj_list:       # intern every vertex first so the vertex order is kept
+                self._intern(name)
+            for name, neighbors in adj_list.items():
+                self[name] = neighbors
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, name):
+        return CompactNeighbors(self, self._ids[name])
+
+    def __setitem__(self, name, neighbors):
+        index = self._intern(name)
+        ids, seen = array('i'), set()
+        for neighbor in neighbors:
+            neighbor_id = self._intern(neighbor)
+            if neighbor_id not in seen:
+                seen.add(neighbor_id)
+                ids.append(neighbor_id)
+        self._garbage += self._capacity[index]
+        self._index.pop(index, None)
+        self._start[index] = len(self._pool)
+        self._pool.extend(ids)
+        self._degree[index] = self._capacity[index] = len(ids)
+        self._collect()
+
+    def __delitem__(self, name):
+        index = self._ids.pop(name)
+        # Adjacency is symmetric, so only the vertex's own neighbors can refer to its id
+        for neighbor in self._block(index):
+            if self._names[neighbor] is not None and neighbor != index and self._has(neighbor, index):
+                self._unlink(neighbor, index)
+        self._names[index] = None
+        self._garbage += self._capacity[index]
+        self._degree[index] = self._capacity[index] = 0
+        self._index.pop(index, None)
+        self._free.append(index)
+        self._collect()
+
+    def __repr__(self):
+        return repr({name: self[name] for name in self._ids})
+
+    def pop(self, name, *default):
+        """
+        Remove name and return its neighbors as a list of names.
+        """
+        if name not in self._ids:
+            if default:
+                return default[0]
+            raise KeyError(name)
+        neighbors = self[name].copy()
+        del self[name]
+        return neighbors
+
+    def _intern(self, name) -> int:
+        """
+        Return the id of name, adding it as a vertex with no neighbors if it is new.
+        """
+        index = self._ids.get(name)
+        if index is not None:
+            return index
+        if self._free:
+            index = self._free.pop()
+            self._names[index] = name
+            self._start[index] = len(self._pool)
+        else:
+            index = len(self._names)
+            self._names.append(name)
+            self._start.append(len(self._pool))
+            self._degree.append(0)
+            self._capacity.append(0)
+        self._ids[name] = index
+        return index
+
+    def _block(self, index: int) -> array:
+        """
+        Return a copy of the neighbor ids of id index in insertion order.
+        """
+        start = self._start[index]
+        return self._pool[start:start + self._degree[index]]
+
+    def _has(self, index: int, neighbor: int) -> bool:
+        """
+        Return True if id neighbor is in the neighbors of id index.
+        """
+        ids = self._index.get(index)
+        if ids is None:
+            if self._degree[index] < _INDEX_MIN_DEGREE:
+                return neighbor in self._block(index)
+            ids = self._index[index] = array('i', sorted(self._block(index)))
+        position = bisect_left(ids, neighbor)
+        return position < len(ids) and ids[position] == neighbor
+
+    def _link(self, index: int, neighbor: int) -> None:
+        """
+        Add id neighbor to the neighbors of id index (no-op if it is already there).
+        """
+        if self._has(index, neighbor):
+            return
+        degree = self._degree[index]
+        if degree == self._capacity[index]:
+            self._grow(index)
+        self._pool[self._start[index] + degree] = neighbor
+        self._degree[index] = degree + 1
+        ids = self._index.get(index)
+        if ids is not None:
+            insort(ids, neighbor)
+
+    def _unlink(self, index: int, neighbor: int) -> None:
+        """
+        Remove id neighbor from the neighbors of id index, keeping the others in order; it must be there.
+        """
+        pool, start = self._pool, self._start[index]
+        end = start + self._degree[index]
+        position = pool.index(neighbor, start, end)
+        pool[position:end - 1] = pool[position + 1:end]
+        self._degree[index] -= 1
+        ids = self._index.get(index)
+        if ids is not None:
+            if self._degree[index] < _INDEX_MIN_DEGREE // 2:
+                del self._index[index]
+            else:
+                del ids[bisect_left(ids, neighbor)]
+
+    def _grow(self, index: int) -> None:
+        """
+        Double the room of id index's block, in place if it ends the pool, otherwise by moving it to the end.
+        """
+        pool, start = self._pool, self._start[index]
+        capacity = self._capacity[index]
+        room = max(1, 2 * capacity)
+        if start + capacity == len(pool):
+            pool.extend(_ZEROS * (room - capacity))
+        else:
+            self._garbage += capacity
+            self._start[index] = len(pool)
+            pool.extend(pool[start:start + self._degree[index]])
+            pool.extend(_ZEROS * (room - self._degree[index]))
+        self._capacity[index] = room
+        self._collect()
+
+    def _collect(self) -> None:
+        """
+        Rewrite the pool without the abandoned blocks once they hold half of it. Blocks keep their room.
+        """
+        if 2 * self._garbage <= len(self._pool):
+            return
+        pool, fresh = self._pool, array('i')
+        for index in self._ids.values():
+            start, degree = self._start[index], self._degree[index]
+            self._start[index] = len(fresh)
+            fresh.extend(pool[start:start + degree])
+            fresh.extend(_ZEROS * (self._capacity[index] - degree))
+        for index in self._free:
+            self._start[index] = len(fresh)
+        self._pool = fresh
+        self._garbage = 0
+
+
+class CompactNeighbors:
+    """
+    List-like view of one vertex's neighbors in a CompactAdjacency, translating ids back to names.
+    """
+    __slots__ = ('_adjacency', '_id')
+
+    def __init__(self, adjacency: CompactAdjacency, index: int):
+        self._adjacency = adjacency
+        self._id = index
+
+    def _ids(self):
+        return self._adjacency._block(self._id)
+
+    def __contains__(self, name):
+        index = self._adjacency._ids.get(name)
+        return index is not None and self._adjacency._has(self._id, index)
+
+    def __iter__(self):
+        names = self._adjacency._names
+        return (names[index] for index in self._ids())
+
+    def __reversed__(self):
+        names = self._adjacency._names
+        return (names[index] for index in reversed(self._ids()))
+
+    def __len__(self):
+        return self._adjacency._degree[self._id]
+
+    def __getitem__(self, index):
+        return self.copy()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (CompactNeighbors, NeighborList, list)):
+            return self.copy() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.copy())
+
+    def append(self, name) -> None:
+        """
+        Add name at the end (no-op if it is already a neighbor).
+        """
+        self._adjacency._link(self._id, self._adjacency._intern(name))
+
+    def remove(self, name) -> None:
+        """
+        Remove name. Raises ValueError if it is not a neighbor, like list.remove.
+        """
+        index = self._adjacency._ids.get(name)
+        if index is None or not self._adjacency._has(self._id, index):
+            raise ValueError(f'{name!r} not in neighbor list')
+        self._adjacency._unlink(self._id, index)
+
+    def discard(self, name) -> None:
+        """
+        Remove name if it is a neighbor.
+        """
+        if name in self:
+            self.remove(name)
+
+    def copy(self) -> []:
+        """
+        Return the neighbors as a new list of names.
+        """
+        names = self._adjacency._names
+        return [names[index] for index in self._ids()]
+
+
+class CSRRow:
+    """
+    Read-only row of a CSRMatrix, with the same read interface as SparseRow.
+    """
+    __slots__ = ('_matrix', '_start', '_end')
+
+    def __init__(self, matrix, index: int):
+        self._matrix = matrix
+        self._start = matrix.offsets[index]
+        self._end = matrix.offsets[index + 1]
+
+    def __getitem__(self, dst):
+        targets = self._matrix.targets
+        position = bisect_left(targets, dst, self._start, self._end)
+        if position < self._end and targets[position] == dst:
+            return self._matrix.weights[position]
+        return 0
+
+    def __setitem__(self, dst, weight):
+        raise TypeError('CSR storage is read-only; convert it with set_storage first')
+
+    def __len__(self):
+        return len(self._matrix)
+
+    def __iter__(self):
+        row = [0] * len(self._matrix)
+        for j, weight in self.items():
+            row[j] = weight
+        return iter(row)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def keys(self) -> []:
+        """
+        Return the dst of each non-zero cell in ascending order.
+        """
+        return self._matrix.targets[self._start:self._end].tolist()
+
+    def items(self) -> []:
+        """
+        Return (dst, weight) pairs of the non-zero cells in ascending dst order.
+        """
+        matrix = self._matrix
+        return list(zip(matrix.targets[self._start:self._end].tolist(),
+                        matrix.weights[self._start:self._end].tolist()))
+
+    def nnz(self) -> int:
+        """
+        Return number of non-zero cells in the row.
+        """
+        return self._end - self._start
+
+
+class MixedWeights:
+    """
+    Read-only CSR weights that mix int and float values and keep both exact: entry i is 8 bytes of bits
+    holding an int64 where flags[i] is 1 and a float64 where it is 0. bits and flags can be arrays or
+    memoryviews over an mmap, and slicing returns another MixedWeights over slices of them.
+    """
+    __slots__ = ('bits', 'flags', '_floats')
+
+    def __init__(self, bits, flags):
+        self.bits = bits
+        self.flags = flags
+        self._floats = memoryview(bits).cast('B').cast('d')
+
+    @classmethod
+    def pack(cls, weights: []):
+        """
+        Return the MixedWeights holding the int and float values of weights in order.
+        """
+        flags = array('B', (isinstance(weight, int) for weight in weights))
+        bits = array('q', (weight if integral else 0 for weight, integral in zip(weights, flags)))
+        floats = memoryview(bits).cast('B').cast('d')
+        for index, integral in enumerate(flags):
+            if not integral:
+                floats[index] = weights[index]
+        floats.release()
+        return cls(bits, flags)
+
+    def __len__(self):
+        return len(self.flags)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return MixedWeights(self.bits[index], self.flags[index])
+        return self.bits[index] if self.flags[index] else self._floats[index]
+
+    def tolist(self) -> []:
+        """
+        Return the weights as a list of ints and floats.
+        """
+        return [whole if integral else real
+                for whole, real, integral in zip(self.bits.tolist(), self._floats.tolist(), self.flags)]
+
+
+class CSRMatrix:
+    """
+    Read-only adjacency matrix in compressed sparse row form: row i's edges are targets[offsets[i]:offsets[i + 1]]
+    (ascending) with matching weights. The arrays can be any int/float sequences (or a MixedWeights),
+    including memoryviews over an mmap, so a loaded snapshot is served without copying.
+    """
+    __slots__ = ('offsets', 'targets', 'weights', '_source')
+
+    def __init__(self, offsets, targets, weights, source=None):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._source = source       # object owning the buffers (e.g. a Snapshot), kept alive with the matrix
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('row index out of range')
+        return CSRRow(self, index)
+
+    def __iter__(self):
+        return (CSRRow(self, i) for i in range(len(self)))
+
+    def nnz(self) -> int:
+        """
+        Return number of non-zero cells (edges) in the matrix.
+        """
+        return len(self.targets)
+
+
+class CSRAdjacency(Mapping):
+    """
+    Read-only adjacency list mapping served from CSR arrays: vertex i is names[i] and its neighbors are
+    targets[offsets[i]:offsets[i + 1]], in their original order. Only the name lookup table is built in
+    memory; the neighbor arrays can be memoryviews over an mmap.
+    """
+    __slots__ = ('_ids', '_names', 'offsets', 'targets', '_source')
+
+    def __init__(self, names: [], offsets, targets, source=None):
+        self._names = names
+        self._ids = {name: index for index, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self._source = source
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __getitem__(self, name):
+        index = self._ids[name]
+        return CSRNeighbors(self, self.offsets[index], self.offsets[index + 1])
+
+    def __repr__(self):
+        return repr({name: self[name] for name in self._names})
+
+
+class CSRNeighbors:
+    """
+    Read-only list-like view of one vertex's neighbors in a CSRAdjacency.
+    """
+    __slots__ = ('_adjacency', '_start', '_end')
+
+    def __init__(self, adjacency: CSRAdjacency, start: int, end: int):
+        self._adjacency = adjacency
+        self._start = start
+        self._end = end
+
+    def __contains__(self, name):
+        index = self._adjacency._ids.get(name)
+        return index is not None and index in self._adjacency.targets[self._start:self._end].tolist()
+
+    def __iter__(self):
+        return iter(self.copy())
+
+    def __reversed__(self):
+        return reversed(self.copy())
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __getitem__(self, index):
+        return self.copy()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (CSRNeighbors, CompactNeighbors, NeighborList, list)):
+            return self.copy() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.copy())
+
+    def copy(self) -> []:
+        """
+        Return the neighbors as a new list of names.
+        """
+        names = self._adjacency._names
+        return [names[index] for index in self._adjacency.targets[self._start:self._end].tolist()]
@@ -0,0 +1,167 @@
+# Course: CS261 - Data Structures
+# Author: Nelsyda Perez
+# Assignment: 6 - Graph Implementation
+# Description: Iterative traversal and cycle detection shared by the undirected and directed graph ADTs
+#
+# Every function takes a neighbors(vertex) callable returning the adjacent vertices in the order they
+# should be picked, so the graph classes only have to say how to list a vertex's neighbors.
+
+from array import array
+from collections import deque
+
+_ON_PATH = 1
+_DONE = 2
+
+
+def iter_dfs(start, neighbors):
+    """
+    Yield vertices in depth-first order from start, each as soon as it is visited.
+    neighbors(vertex) must return a sequence (it is walked in reverse onto the stack).
+    """
+    seen = set()
+    stack = [start]
+    while stack:
+        vertex = stack.pop()
+        if vertex in seen:
+            continue
+        seen.add(vertex)
+        yield vertex
+        stack.extend(adjacent for adjacent in reversed(neighbors(vertex)) if adjacent not in seen)
+
+
+def iter_bfs(start, neighbors):
+    """
+    Yield vertices in breadth-first order from start, each as soon as it is visited.
+    """
+    seen = set()
+    queue = deque([start])
+    while queue:
+        vertex = queue.popleft()
+        if vertex in seen:
+            continue
+        seen.add(vertex)
+        yield vertex
+        queue.extend(adjacent for adjacent in neighbors(vertex) if adjacent not in seen)
+
+
+def iter_multi_source_bfs(sources: [], neighbors, max_depth=None):
+    """
+    Breadth-first search from all of sources at once. Every vertex carries an integer bitmask with bit i set
+    once sources[i] has reached it, so one pass over a level's edges advances the whole batch.
+    Yield (depth, vertex, mask) for every vertex first reached at depth by the sources whose bits are in mask,
+    level by level, stopping after max_depth (if given).
+    """
+    frontier = {}
+    for bit, source in enumerate(sources):
+        frontier[source] = frontier.get(source, 0) | (1 << bit)
+    visited = dict(frontier)
+    depth = 0
+    while frontier:
+        for vertex, mask in frontier.items():
+            yield depth, vertex, mask
+        if depth == max_depth:
+            return
+        depth += 1
+        reached = {}
+        for vertex, mask in frontier.items():
+            for adjacent in neighbors(vertex):
+                reached[adjacent] = reached.get(adjacent, 0) | mask
+        frontier = {}
+        for vertex, mask in reached.items():
+            seen = visited.get(vertex, 0)
+            mask &= ~seen
+            if mask:
+                frontier[vertex] = mask
+                visited[vertex] = seen | mask
+
+
+def multi_source_distances(sources: [], is_vertex, neighbors, column, width: int, max_depth=None,
+                           batch_size: int = 64) -> []:
+    """
+    Return one array('i') of width BFS hop counts per source, with the count for vertex at column(vertex):
+    -1 where the source does not reach the vertex (within max_depth hops, if given). Sources are searched
+    batch_size at a time through iter_multi_source_bfs; sources failing is_vertex reach nothing.
+    """
+    unreached = array('i', [-1]) * width
+    result = [array('i', unreached) for _ in sources]
+    for start in range(0, len(sources), batch_size):
+        rows = [i for i in range(start, min(start + batch_size, len(sources))) if is_vertex(sources[i])]
+        for depth, vertex, mask in iter_multi_source_bfs([sources[i] for i in rows], neighbors, max_depth):
+            distances_at = column(vertex)
+            while mask:
+                low = mask & -mask
+                result[rows[low.bit_length() - 1]][distances_at] = depth
+                mask ^= low
+    return result
+
+
+def visit_until(vertices, end=None) -> []:
+    """
+    Return the vertices produced by a traversal up to and including end (all of them if end is None).
+    """
+    visited = []
+    for vertex in vertices:
+        visited.append(vertex)
+        if vertex == end:
+            break
+    return visited
+
+
+def topological_sort(vertices, neighbors, stats=None):
+    """
+    Return every vertex reachable from vertices in topological order (reverse depth-first postorder), or None
+    if following neighbors leads back onto the current path, i.e. there is a cycle.
+    If stats (a GraphStats) is given, the longest search path is reported to it as the recursion depth.
+    """
+    state = {}
+    postorder = []
+    for root in vertices:
+        if root in state:
+            continue
+        state[root] = _ON_PATH
+        stack = [(root, iter(neighbors(root)))]
+        while stack:
+            vertex, adjacent_iter = stack[-1]
+            for adjacent in adjacent_iter:
+                adjacent_state = state.get(adjacent)
+                if adjacent_state is None:
+                    state[adjacent] = _ON_PATH
+                    stack.append((adjacent, iter(neighbors(adjacent))))
+                    if stats is not None:
+                        stats.reach_depth(len(stack))
+                    break
+                if adjacent_state == _ON_PATH:
+                    return None
+            else:
+                state[vertex] = _DONE
+                postorder.append(vertex)
+                stack.pop()
+    postorder.reverse()
+    return postorder
+
+
+def has_undirected_cycle(vertices, neighbors, stats=None) -> bool:
+    """
+    Return True if a depth-first search reaches an already visited vertex other than by going back along
+    the edge it came in on. stats is used as in topological_sort.
+    """
+    seen = set()
+    for root in vertices:
+        if root in seen:
+            continue
+        seen.add(root)
+        stack = [(root, None, iter(neighbors(root)))]
+        while stack:
+            vertex, previous, adjacent_iter = stack[-1]
+            for adjacent in adjacent_iter:
+                if adjacent not in seen:
+                    seen.add(adjacent)
+                    stack.append((adjacent, vertex, iter(neighbors(adjacent))))
+                    if stats is not None:
+                        stats.reach_depth(len(stack))
+                    break
+                if adjacent != previous:
+                    return True
+            else:
+                stack.pop()
+    return False
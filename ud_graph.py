@@ -3,11 +3,20 @@
 # Assignment: 6 - Graph Implementation
 # Description: Implementation of an undirected graph ADT
 
-import heapq
-from collections import deque
+from array import array
 
+from graph_cache import QueryCacheMixin, cached_query
+from graph_components import ComponentTracker
+from graph_degrees import DegreeTracker
+from graph_io import iter_batches, iter_edge_file, read_snapshot, write_snapshot
+from graph_paths import flatten_paths, path_results
+from graph_snapshot import SnapshotMixin
+from graph_stats import GraphStatsMixin, instrumented
+from graph_storage import CompactAdjacency, CSRAdjacency, NeighborList
+from graph_traversal import has_undirected_cycle, iter_bfs, iter_dfs, multi_source_distances, visit_until
 
-class UndirectedGraph:
+
+class UndirectedGraph(QueryCacheMixin, GraphStatsMixin, SnapshotMixin):
     """
     Class to implement undirected graph
     - duplicate edges not allowed
@@ -16,6 +25,13 @@ class UndirectedGraph:
     - vertex names are strings
     """
 
+    # Backend a loaded or published 'csr' graph is converted to before its first change
+    _WRITABLE_STORAGE = 'list'
+    # Opt-in connected component tracker (see track_components)
+    _components = None
+    # Vertex/edge counts and degree histogram, created by the first size query and then kept up to date
+    _degrees = None
+
     def __init__(self, start_edges=None):
         """
         Store graph info as adjacency list
@@ -50,7 +66,13 @@ class UndirectedGraph:
         if v in self.adj_list:
             return
         else:
-            self.adj_list[v] = []
+            self._writable()
+            self._version += 1
+            self.adj_list[v] = NeighborList()
+            if self._components is not None:
+                self._components.add_vertex(v)
+            if self._degrees is not None:
+                self._degrees.add_vertex()
         
     def add_edge(self, u: str, v: str) -> None:
         """
@@ -59,10 +81,18 @@ class UndirectedGraph:
         # Does nothing if vertices are equal
         if u == v:
             return
+        new_u, new_v = u not in self.adj_list, v not in self.adj_list
+        added = new_u or new_v or v not in self.adj_list[u]
+
+        # Does nothing (and keeps cached results) if the edge already exists
+        if not added:
+            return
+        self._writable()
+        self._version += 1
 
         # Adds vertex u if it does not not exist
         if u not in self.adj_list:
-            self.adj_list[u] = [v]
+            self.adj_list[u] = NeighborList((v,))
 
         # Adds v to adjacent vertices list for vertex u if it does not exist already
         elif v not in self.adj_list[u]:
@@ -70,12 +100,20 @@ class UndirectedGraph:
 
         # Adds vertex v if it does not not exist
         if v not in self.adj_list:
-            self.adj_list[v] = [u]
+            self.adj_list[v] = NeighborList((u,))
 
         # Adds u to adjacent vertices list for vertex v if it does not exist already
         elif u not in self.adj_list[v]:
             self.adj_list[v].append(u)
 
+        if self._components is not None:
+            self._components.add_edge(u, v)
+        if self._degrees is not None:
+            for new in (new_u, new_v):
+                if new:
+                    self._degrees.add_vertex()
+            self._degrees.add_edge(u, v)
+
     def remove_edge(self, v: str, u: str) -> None:
         """
         Remove edge from the graph
@@ -86,8 +124,14 @@ class UndirectedGraph:
 
         # Removes edge (adjacent vertices from their respective lists) if the edge exists
         if u in self.adj_list[v] and v in self.adj_list[u]:
+            self._writable()
+            self._version += 1
             self.adj_list[v].remove(u)
             self.adj_list[u].remove(v)
+            if self._components is not None:
+                self._components.remove_edge(v, u)
+            if self._degrees is not None:
+                self._degrees.remove_edge(v, u)
 
     def remove_vertex(self, v: str) -> None:
         """
@@ -95,33 +139,32 @@ class UndirectedGraph:
         """
         if v not in self.adj_list:
             return
-        del self.adj_list[v]
-        for vertex in self.adj_list:
-            if v in self.adj_list[vertex]:
-                self.adj_list[vertex].remove(v)
+        self._writable()
+        self._version += 1
+
+        # Only the removed vertex's own neighbors can hold a reference to it
+        neighbors = self.adj_list.pop(v)
+        for vertex in neighbors:
+            self.adj_list[vertex].discard(v)
+        if self._components is not None:
+            self._components.remove_vertex(v, neighbors)
+        if self._degrees is not None:
+            self._degrees.remove_vertex(neighbors)
 
     def get_vertices(self) -> []:
         """
         Return list of vertices in the graph (any order)
         """
-        list_of_vertices = []
-        for vertex in self.adj_list:
-            list_of_vertices.append(vertex)
-        return list_of_vertices
+        return list(self.iter_vertices())
 
+    @instrumented
     def get_edges(self) -> []:
         """
         Return list of edges in the graph (any order)
         """
-        list_of_edges = []
-        previous = []
-        for vertex in self.adj_list:
-            for adjacent in self.adj_list[vertex]:
-                if adjacent not in previous:
-                    list_of_edges.append((vertex, adjacent))
-            previous.append(vertex)
-        return list_of_edges
+        return list(self.iter_edges())
 
+    @instrumented
     def is_valid_path(self, path: []) -> bool:
         """
         Return True if provided path is valid, False otherwise
@@ -142,6 +185,21 @@ class UndirectedGraph:
             index += 1
         return True
 
+    @instrumented
+    def validate_paths(self, paths, offsets=None, first_invalid: bool = False):
+        """
+        Check many paths at once. paths is an iterable of paths or, with offsets, a flat sequence of vertices
+        where path i is paths[offsets[i]:offsets[i + 1]]. Returns a boolean array (see path_results) telling
+        which paths is_valid_path accepts; with first_invalid, also the position in each path of the first
+        vertex that does not exist or is not adjacent to the one before it (-1 for valid paths).
+        Every hop is a hashed lookup in the neighbor set of the vertex before it.
+        """
+        hops, offsets = flatten_paths(paths, offsets)
+        first = [self._first_invalid(hops, offsets[i], offsets[i + 1]) for i in range(len(offsets) - 1)]
+        return path_results(first, first_invalid)
+
+    @instrumented
+    @cached_query
     def dfs(self, v_start, v_end=None) -> []:
         """
         Return list of vertices visited during DFS search
@@ -151,24 +209,10 @@ class UndirectedGraph:
             return []
         if v_end is not None and v_end not in self.adj_list:
             v_end = None
-        stack = deque()
-        stack.append(v_start)
-        visited = []
-        successors = []
-        while stack:
-            vertex = stack.pop()
-            if vertex not in visited:
-                visited.append(vertex)
-                if vertex is v_end:
-                    return visited
-                temp = self.adj_list[vertex].copy()
-                heapq.heapify(temp)
-                while temp:
-                    successors.append(heapq.heappop(temp))
-                while successors:
-                    stack.append(successors.pop())
-        return visited
+        return visit_until(self.iter_dfs(v_start), v_end)
 
+    @instrumented
+    @cached_query
     def bfs(self, v_start, v_end=None) -> []:
         """
         Return list of vertices visited during BFS search
@@ -178,69 +222,360 @@ class UndirectedGraph:
             return []
         if v_end is not None and v_end not in self.adj_list:
             v_end = None
-        stack = deque()
-        stack.append(v_start)
-        visited = []
-        while stack:
-            vertex = stack.popleft()
-            if vertex not in visited:
-                visited.append(vertex)
-                if vertex is v_end:
-                    return visited
-                successors = self.adj_list[vertex].copy()
-                heapq.heapify(successors)
-                while successors:
-                    if successors[0] not in visited:
-                        stack.append(heapq.heappop(successors))
-                    else:
-                        heapq.heappop(successors)
-        return visited
+        return visit_until(self.iter_bfs(v_start), v_end)
 
+    @instrumented
     def count_connected_components(self):
         """
         Return number of connected components in the graph
         """
-        list_of_vertices = self.get_vertices()
+        if self._components is not None:
+            return self._components.count()
+        seen = set()
         count = 0
-        while list_of_vertices:
-            count += 1
-            path = self.dfs(list_of_vertices[0])
-            for vertex in path:
-                list_of_vertices.remove(vertex)
+        for vertex in self.adj_list:
+            if vertex not in seen:
+                count += 1
+                seen.update(self.iter_dfs(vertex))     # uncached: one entry per component would flood the cache
         return count
 
+    @instrumented
     def has_cycle(self):
         """
         Return True if graph contains a cycle, False otherwise
         """
-        visited = []
+        # Iterative DFS from every vertex, so long paths cannot hit the recursion limit
+        return has_undirected_cycle(self.adj_list, self._counted(self.adj_list.__getitem__), self._stats)
+
+    # ------------------------------------------------------------------ #
+
+    def iter_vertices(self):
+        """
+        Yield the vertices in insertion order without copying them.
+        """
+        return iter(self.adj_list)
 
-        # Checks every DPS path by setting all vertices as the starting vertices for each possible DPS.
+    def iter_edges(self):
+        """
+        Yield every edge once as a (vertex, adjacent) pair, in get_edges order, in O(V + E).
+        An edge is reported from whichever endpoint comes first in vertex order.
+        """
+        previous = set()
         for vertex in self.adj_list:
-            # Checks if the vertex has been fully analyzed prior to the recursive call
-            if vertex not in visited:
-                if self._has_cycle_rec(vertex, visited):
-                    return True
-                
-        return False  # All possible DPS paths have been analyzed and no cycle has been found
-
-    def _has_cycle_rec(self, vertex, visited, previous=None):
-        """
-        Recursive helper function for has_cycle.
-        """
-        visited.append(vertex)  # keeps track of all vertices that have been fully explored (all edges analyzed)
-
-        # Recursive call for all adjacent nodes made
-        for adjacent in self.adj_list[vertex]:
-            if adjacent not in visited:
-                if self._has_cycle_rec(adjacent, visited, vertex):  # Recursion occurs if adj. vertex is not visited
-                    return True
-
-            # Checks if the visited vertex is connected to the current vertex. Note that for a cycle to occur, backwards
-            # movement along the same edge is not allowed.
-            elif previous != adjacent:
-                return True
-        return False
+            for adjacent in self.adj_list[vertex]:
+                if adjacent not in previous:
+                    yield vertex, adjacent
+            previous.add(vertex)
+
+    def vertex_count(self) -> int:
+        """
+        Return number of vertices in the graph (O(1)).
+        """
+        return len(self.adj_list)
+
+    def edge_count(self) -> int:
+        """
+        Return number of edges in the graph (O(1) after the first size query).
+        """
+        return self._tracked_degrees().edges
+
+    def degree_histogram(self) -> dict:
+        """
+        Return degree -> number of vertices with that degree, kept up to date by every mutating method.
+        """
+        return dict(self._tracked_degrees().histogram)
+
+    def iter_dfs(self, v_start):
+        """
+        Yield vertices in DFS order (alphabetical picks) as they are visited, so callers can stop early.
+        """
+        if v_start not in self.adj_list:
+            return iter(())
+        return iter_dfs(v_start, self._counted(self._neighbors))
+
+    def iter_bfs(self, v_start):
+        """
+        Yield vertices in BFS order (alphabetical picks) as they are visited, so callers can stop early.
+        """
+        if v_start not in self.adj_list:
+            return iter(())
+        return iter_bfs(v_start, self._counted(self._neighbors))
+
+    @instrumented
+    def shortest_path(self, u: str, v: str) -> []:
+        """
+        Return the vertices on a shortest path from u to v (inclusive), or an empty list if there is none.
+        Searches from both ends at once, always growing the smaller frontier, until the searches meet.
+        """
+        if u not in self.adj_list or v not in self.adj_list:
+            return []
+        return self._bidirectional_bfs(u, v, {}, {})
+
+    @instrumented
+    def shortest_paths(self, pairs) -> []:
+        """
+        Return shortest_path(u, v) for every (u, v) in pairs, reusing the search tables between queries.
+        """
+        from_u, from_v = {}, {}
+        paths = []
+        for u, v in pairs:
+            if u not in self.adj_list or v not in self.adj_list:
+                paths.append([])
+                continue
+            from_u.clear()
+            from_v.clear()
+            paths.append(self._bidirectional_bfs(u, v, from_u, from_v))
+        return paths
+
+    @instrumented
+    def multi_source_bfs(self, sources, max_depth: int = None, batch_size: int = 64) -> []:
+        """
+        Return one array('i') of BFS hop counts per source, indexed by each vertex's position in
+        get_vertices(): -1 where the source does not reach the vertex (within max_depth hops, if given), so
+        reachability is distance >= 0.
+        Sources are searched batch_size at a time, one bit per source in a per-vertex bitmask, so each batch
+        walks the edges once instead of once per source. Sources that are not vertices reach nothing.
+        """
+        position = {vertex: i for i, vertex in enumerate(self.adj_list)}
+        return multi_source_distances(list(sources), position.__contains__,
+                                      self._counted(self.adj_list.__getitem__), position.__getitem__,
+                                      len(position), max_depth, batch_size)
+
+    def track_components(self, enabled: bool = True) -> None:
+        """
+        Turn incremental connected component tracking on or off. While on, count_connected_components and
+        same_component are O(1) and every mutation updates the components locally.
+        """
+        self._components = ComponentTracker(self.adj_list) if enabled else None
+
+    def same_component(self, u: str, v: str) -> bool:
+        """
+        Return True if u and v are vertices in the same connected component.
+        """
+        if self._components is not None:
+            return self._components.same(u, v)
+        if u not in self.adj_list or v not in self.adj_list:
+            return False
+        return any(vertex == v for vertex in self.iter_bfs(u))
+
+    @classmethod
+    def compact_graph(cls, start_edges=None):
+        """
+        Return a new graph that uses compact storage from the start.
+        Takes the same start_edges as the constructor.
+        """
+        graph = cls()
+        graph.set_storage('compact')
+        if start_edges is not None:
+            for u, v in start_edges:
+                graph.add_edge(u, v)
+        return graph
+
+    @property
+    def storage(self) -> str:
+        """
+        Name of the backend currently holding adj_list ('list', 'compact' or 'csr').
+        """
+        if isinstance(self.adj_list, CompactAdjacency):
+            return 'compact'
+        if isinstance(self.adj_list, CSRAdjacency):
+            return 'csr'
+        return 'list'
+
+    def set_storage(self, kind: str) -> None:
+        """
+        Convert adj_list to another backend in place, keeping vertex and neighbor order.
+        'list' maps names to NeighborList sets (O(1) edge checks), 'compact' interns names to int ids and
+        keeps every vertex's neighbors in one shared int array (a fraction of the memory; edge checks scan
+        the neighbors, or binary-search them for high-degree vertices).
+        The read-only 'csr' backend only comes from load() and can be converted away but not to.
+        """
+        if kind not in ('list', 'compact'):
+            raise ValueError(f"unknown storage '{kind}'")
+        self._check_unpublished()
+        if kind == self.storage:
+            return
+        if kind == 'compact':
+            adj_list = CompactAdjacency(self.adj_list)
+        else:
+            adj_list = {v: NeighborList(self.adj_list[v]) for v in self.adj_list}
+        self.adj_list = adj_list
+        if self._components is not None:
+            self.track_components()
+        if self._degrees is not None:
+            self._degrees = DegreeTracker(adj_list)
+
+    def save(self, path: str) -> None:
+        """
+        Write the graph to path as a binary snapshot (vertex names, CSR offsets and targets) for load().
+        """
+        names, offsets, targets = self._csr_arrays()
+        for name in names:
+            if not isinstance(name, str):
+                raise TypeError(f'vertex names must be strings to be saved, got {name!r}')
+        write_snapshot(path, False, offsets, targets, names=names)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """
+        Return a graph read from a snapshot written by save(). With mmap the neighbor arrays are served straight
+        from the mapped file (read-only 'csr' storage shared through the page cache); the first change converts
+        the graph to 'list' storage.
+        """
+        snapshot = read_snapshot(path, mmap)
+        if snapshot.directed:
+            raise ValueError(f'{path} holds a directed graph')
+        graph = cls()
+        graph.adj_list = CSRAdjacency(snapshot.names, snapshot.offsets, snapshot.targets, snapshot)
+        return graph
+
+    @classmethod
+    def from_edge_file(cls, path: str):
+        """
+        Return a new graph loaded from an edge-list file of 'u v' lines (CSV or whitespace).
+        The file is streamed, never read into memory as a whole.
+        """
+        graph = cls()
+        graph.add_edges_bulk((fields[0], fields[1]) for fields in iter_edge_file(path))
+        return graph
+
+    def add_edges_bulk(self, edges, batch_size: int = 65536) -> None:
+        """
+        Add many (u, v) edges. Gives the same graph as calling add_edge for each one, but edges are
+        consumed lazily in batches and duplicates (in either direction) are dropped per batch.
+        """
+        self._writable()
+        adj_list = self.adj_list
+        self._version += 1
+        for batch in iter_batches(edges, batch_size):
+            unique = {}
+            for u, v in batch:
+                if u == v:
+                    continue
+                key = frozenset((u, v))
+                if key not in unique:
+                    unique[key] = (u, v)
+            for u, v in unique.values():
+                if u not in adj_list:
+                    adj_list[u] = NeighborList()
+                if v not in adj_list:
+                    adj_list[v] = NeighborList()
+                adj_list[u].append(v)
+                adj_list[v].append(u)
+                if self._components is not None:
+                    self._components.add_edge(u, v)
+        if self._degrees is not None:
+            self._degrees = DegreeTracker(adj_list)
+
+    def _bidirectional_bfs(self, u: str, v: str, from_u: dict, from_v: dict) -> []:
+        """
+        Bidirectional BFS between two existing vertices. from_u and from_v must be empty and are filled with
+        vertex -> (parent, depth) for each side. One whole level is expanded at a time and the best meeting
+        point in that level is kept, which makes the result a shortest path.
+        """
+        if u == v:
+            return [u]
+        adj_list = self.adj_list
+        from_u[u] = (None, 0)
+        from_v[v] = (None, 0)
+        frontier_u, frontier_v = [u], [v]
+        popped = scanned = 0
+
+        while frontier_u and frontier_v:
+            # Grow the smaller side
+            if len(frontier_u) <= len(frontier_v):
+                frontier, seen, other = frontier_u, from_u, from_v
+            else:
+                frontier, seen, other = frontier_v, from_v, from_u
+            best, meet = None, None
+            next_frontier = []
+            popped += len(frontier)
+            for vertex in frontier:
+                depth = seen[vertex][1] + 1
+                adjacent_list = adj_list[vertex]
+                scanned += len(adjacent_list)
+                for adjacent in adjacent_list:
+                    if adjacent in seen:
+                        continue
+                    seen[adjacent] = (vertex, depth)
+                    next_frontier.append(adjacent)
+                    reached = other.get(adjacent)
+                    if reached is not None and (best is None or depth + reached[1] < best):
+                        best, meet = depth + reached[1], adjacent
+            if meet is not None:
+                if self._stats is not None:
+                    self._stats.record(popped, scanned)
+                path = self._walk_parents(from_u, meet)
+                path.reverse()
+                path.extend(self._walk_parents(from_v, meet)[1:])
+                return path
+            if seen is from_u:
+                frontier_u = next_frontier
+            else:
+                frontier_v = next_frontier
+        if self._stats is not None:
+            self._stats.record(popped, scanned)
+        return []
+
+    @staticmethod
+    def _walk_parents(parents: dict, vertex) -> []:
+        """
+        Return vertex followed by its chain of parents up to the search root.
+        """
+        path = []
+        while vertex is not None:
+            path.append(vertex)
+            vertex = parents[vertex][0]
+        return path
+
+    def _first_invalid(self, hops, start: int, end: int) -> int:
+        """
+        Return the position (counted from start) of the first invalid vertex of path hops[start:end], or -1.
+        """
+        adj_list = self.adj_list
+        previous = None
+        for index in range(start, end):
+            vertex = hops[index]
+            if vertex not in adj_list or (index > start and vertex not in adj_list[previous]):
+                return index - start
+            previous = vertex
+        return -1
+
+    def _freeze(self, published) -> None:
+        """
+        Fill the empty graph published with a read-only 'csr' copy of this one (see publish).
+        """
+        published.adj_list = CSRAdjacency(*self._csr_arrays())
+
+    def _csr_arrays(self) -> tuple:
+        """
+        Return (names, offsets, targets): the vertex names and the adjacency lists as CSR arrays of name indices.
+        """
+        names = list(self.adj_list)
+        ids = {name: index for index, name in enumerate(names)}
+        offsets, targets = array('q', [0]), array('i')
+        for name in names:
+            targets.extend(ids[adjacent] for adjacent in self.adj_list[name])
+            offsets.append(len(targets))
+        return names, offsets, targets
+
+    def _tracked_degrees(self) -> DegreeTracker:
+        """
+        Return the degree tracker, counting the graph once if this is the first size query.
+        """
+        if self._degrees is None:
+            self._degrees = DegreeTracker(self.adj_list)
+        return self._degrees
+
+    def _neighbors(self, v: str) -> []:
+        """
+        Return the vertices adjacent to v in alphabetical order.
+        List storage keeps this order up to date as edges change, so it is not re-sorted on every visit.
+        """
+        neighbors = self.adj_list[v]
+        if isinstance(neighbors, NeighborList):
+            return neighbors.sorted()
+        return sorted(neighbors)
 
 
 if __name__ == '__main__':